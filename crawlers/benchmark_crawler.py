@@ -16,6 +16,12 @@ Key features
   dataclass - easy to add more categories later.
 * Multi-process support (`multiprocessing.Pool`) out of the box - the
   default worker count is half the available CPU cores.
+* Detail pages inside a category are fetched by a small thread pool
+  (`imap_unordered`) behind a per-category rate limiter whose interval
+  is scaled by the number of category processes (network waits
+  overlap, ~1 req/s total).
+* On-disk gzip cache of detail pages (`data/cache`) so re-runs skip the
+  network; `--refresh` bypasses it.
 * Clear logging (`logging` module) and full type-hints for readability
   and static analysis.
 
@@ -26,19 +32,27 @@ This file is **self-contained**: no parts omitted.
 # Imports                                                                     #
 ###############################################################################
 
+import argparse
 import csv
+import gzip
+import hashlib
 import logging
-import random
+import os
+import tempfile
+import threading
 import time
 from dataclasses import dataclass
 from multiprocessing import Pool, cpu_count
+from multiprocessing.pool import ThreadPool
 from pathlib import Path
 from typing import Iterable, Mapping, Sequence
 
 import certifi
 import cloudscraper
-from bs4 import BeautifulSoup
-from requests.exceptions import RequestException
+from cloudscraper import CipherSuiteAdapter
+from lxml import etree
+from lxml import html as LH
+from requests.exceptions import HTTPError, RequestException
 
 ###############################################################################
 # Paths & logging                                                             #
@@ -47,6 +61,7 @@ from requests.exceptions import RequestException
 BASE_DIR = Path(__file__).resolve().parent.parent
 RAW_DIR = BASE_DIR / "data" / "raw"
 RAW_DIR.mkdir(parents=True, exist_ok=True)
+CACHE_DIR = BASE_DIR / "data" / "cache"  # 상세 페이지 HTML 캐시 (<sha1(url)>.html.gz)
 
 _logger = logging.getLogger(__name__)
 logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
@@ -55,13 +70,33 @@ logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
 # Constants                                                                   #
 ###############################################################################
 
-BAR_SELECTOR = ".score-bar"
-NAME_SELECTOR = ".score-bar-name"
-VALUE_SELECTOR = ".score-bar-result-number"
 FPS_TABLE_CAPTION = "Average FPS by Resolution"
-FPS_ROW_SEL = "table.specs-table tbody tr"
-FPS_RESOLUTION_SEL = "td.cell-h"
-FPS_VALUE_SEL = "td.cell-s"
+MAX_CATEGORY_PROCESSES = 4  # 카테고리 프로세스 풀 상한
+DETAIL_WORKERS = 6  # 카테고리당 상세 페이지 동시 요청 스레드 수
+DETAIL_CHUNKSIZE = 8  # imap_unordered 작업 묶음 크기
+MIN_REQUEST_INTERVAL = 1.0  # 전체(모든 프로세스·스레드 합산) 최소 요청 간격 (s)
+DEFAULT_RETRY_AFTER = 5.0  # 429/503 응답에 Retry-After 가 없거나 날짜 형식일 때 (s)
+CSV_FLUSH_EVERY = 20  # N 행마다 CSV flush
+
+
+def _cls(name: str) -> str:
+    """XPath predicate equivalent to the CSS class selector ``.name``."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# Compiled once per process - evaluated by libxml2 for every detail page
+_LISTING_TABLE_X = etree.XPath(f"//table[{_cls('table-list')}]")
+_LISTING_ROW_X = etree.XPath(".//tbody//tr")
+_BAR_X = etree.XPath(f".//*[{_cls('score-bar')}]")
+_NAME_X = etree.XPath(f".//*[{_cls('score-bar-name')}]")
+_VALUE_X = etree.XPath(f".//*[{_cls('score-bar-result-number')}]")
+_CARD_TITLE_X = etree.XPath(f"//h3[{_cls('title-h2')}]")
+_CARD_X = etree.XPath(f"ancestor::div[{_cls('card')}][1]")
+_FPS_CAPTION_X = etree.XPath(f"//caption[{_cls('title-h3')}]")
+_FPS_TABLE_X = etree.XPath(f"ancestor::table[{_cls('specs-table')}][1]")
+_FPS_ROW_X = etree.XPath(".//tbody//tr")
+_FPS_RESOLUTION_X = etree.XPath(f".//td[{_cls('cell-h')}]")
+_FPS_VALUE_X = etree.XPath(f".//td[{_cls('cell-s')}]")
 
 ###############################################################################
 # Data models                                                                 #
@@ -140,6 +175,93 @@ def _retry(max_tries: int = 3, backoff: float = 1.5):  # noqa: D401 – decorato
 
     return decorator
 
+
+class RateLimiter:
+    """Thread-safe limiter releasing at most one call per ``min_interval`` seconds.
+
+    Only sleeps for the remainder of the interval, and can be pushed back by
+    :meth:`penalty` when the server asks us to slow down.
+    """
+
+    def __init__(self, min_interval: float = MIN_REQUEST_INTERVAL):
+        self.min_interval = min_interval
+        self._lock = threading.Lock()
+        self._next_ts = 0.0
+
+    def acquire(self) -> None:
+        with self._lock:
+            now = time.monotonic()
+            wait = self._next_ts - now
+            self._next_ts = max(now, self._next_ts) + self.min_interval
+        if wait > 0:
+            time.sleep(wait)
+
+    def penalty(self, seconds: float) -> None:
+        """Hold every caller back for at least *seconds* (e.g. ``Retry-After``)."""
+        with self._lock:
+            self._next_ts = max(self._next_ts, time.monotonic() + seconds)
+
+
+def _retry_after(value: str | None) -> float:
+    try:
+        return max(float(value), 0.0) if value else DEFAULT_RETRY_AFTER
+    except ValueError:  # HTTP-date 형식
+        return DEFAULT_RETRY_AFTER
+
+
+def _cache_path(url: str) -> Path:
+    return CACHE_DIR / f"{hashlib.sha1(url.encode()).hexdigest()}.html.gz"
+
+
+def _cache_get(url: str) -> bytes | None:
+    """Return the cached page body for *url*, or ``None`` on a miss."""
+    try:
+        with gzip.open(_cache_path(url), "rb") as fp:
+            return fp.read()
+    except (OSError, EOFError):
+        return None
+
+
+def _cache_put(url: str, html: bytes) -> None:
+    """Store *html* atomically so concurrent workers never read a partial file."""
+    CACHE_DIR.mkdir(parents=True, exist_ok=True)
+    with tempfile.NamedTemporaryFile(dir=CACHE_DIR, suffix=".tmp", delete=False) as tmp:
+        tmp.write(gzip.compress(html))
+    try:
+        os.replace(tmp.name, _cache_path(url))
+    except OSError:
+        os.unlink(tmp.name)
+        raise
+
+
+_PARSER_LOCAL = threading.local()  # lxml 파서는 스레드 간 공유 불가 → 스레드별 재사용
+
+
+def _parse_html(html: bytes):  # type: ignore[no-untyped-def]
+    """Parse *html* with a reused, trimmed-down parser (no comments/blank text)."""
+    parser = getattr(_PARSER_LOCAL, "parser", None)
+    if parser is None:
+        parser = _PARSER_LOCAL.parser = LH.HTMLParser(
+            encoding="utf-8",
+            remove_blank_text=True,
+            remove_comments=True,
+            collect_ids=False,
+        )
+    return LH.fromstring(html, parser=parser)
+
+
+def _text(node) -> str:  # type: ignore[no-untyped-def]
+    """``get_text(strip=True)`` equivalent for lxml elements."""
+    return "".join(t.strip() for t in node.itertext())
+
+
+def _index_by_text(nodes) -> dict[str, object]:  # type: ignore[no-untyped-def]
+    """One pass ``{normalized text: first node}`` map for title lookups."""
+    index: dict[str, object] = {}
+    for node in nodes:
+        index.setdefault(" ".join(node.text_content().split()), node)
+    return index
+
 ###############################################################################
 # Main crawler class                                                          #
 ###############################################################################
@@ -147,8 +269,9 @@ def _retry(max_tries: int = 3, backoff: float = 1.5):  # noqa: D401 – decorato
 class NanoreviewBenchmarkCrawler:
     """Benchmark crawler encapsulating all logic inside a class."""
 
-    def __init__(self, categories: Iterable[CategoryConfig] | None = None):
+    def __init__(self, categories: Iterable[CategoryConfig] | None = None, refresh: bool = False):
         self.categories: tuple[CategoryConfig, ...] = tuple(categories) if categories else DEFAULT_CATEGORIES
+        self.refresh = refresh  # True → HTML 캐시 무시하고 다시 받기
         _logger.debug("Categories initialised: %s", ", ".join(c.name for c in self.categories))
 
     # ───────────────────────────── HTTP helpers ────────────────────────────
@@ -156,126 +279,231 @@ class NanoreviewBenchmarkCrawler:
     def _create_scraper() -> cloudscraper.CloudScraper:
         scraper = cloudscraper.create_scraper()
         scraper.verify = certifi.where()
+        # 고정 크기 커넥션 풀 → 상세 페이지마다 TCP/TLS 핸드셰이크 재사용
+        # (Cloudflare 우회용 cipher 설정은 유지, 재시도는 _retry 가 담당)
+        scraper.mount(
+            "https://",
+            CipherSuiteAdapter(
+                cipherSuite=scraper.cipherSuite,
+                ecdhCurve=scraper.ecdhCurve,
+                server_hostname=scraper.server_hostname,
+                source_address=scraper.source_address,
+                pool_connections=1,
+                pool_maxsize=8,
+                max_retries=0,
+            ),
+        )
         return scraper
 
     @_retry()
-    def _get_html(self, scraper: cloudscraper.CloudScraper, url: str) -> str:
-        return scraper.get(url, timeout=30).text
+    def _download(
+        self,
+        scraper: cloudscraper.CloudScraper,
+        url: str,
+        limiter: RateLimiter | None = None,
+    ) -> bytes:
+        if limiter is not None:
+            limiter.acquire()  # polite delay - 실제 네트워크 요청에만 적용
+        resp = scraper.get(url, timeout=30)
+        if resp.status_code in (429, 503):
+            wait = _retry_after(resp.headers.get("Retry-After"))
+            if limiter is not None:
+                limiter.penalty(wait)
+            raise HTTPError(f"{resp.status_code} - retry after {wait:.0f}s", response=resp)
+        resp.raise_for_status()  # 403 챌린지/404/5xx 페이지는 반환(→ 캐시)하지 않음
+        # raw bytes 그대로 반환 → _parse_html 이 UTF-8 로 디코딩 (nanoreview 는 UTF-8 고정)
+        return resp.content
+
+    def _get_html(
+        self,
+        scraper: cloudscraper.CloudScraper,
+        url: str,
+        limiter: RateLimiter | None = None,
+    ) -> bytes:
+        """Detail-page fetch backed by the on-disk cache (bypassed with ``refresh``).
+
+        Only 2xx bodies reach the cache - :meth:`_download` raises on anything else.
+        """
+        if not self.refresh and (html := _cache_get(url)) is not None:
+            return html
+        html = self._download(scraper, url, limiter)
+        _cache_put(url, html)
+        return html
 
     # ───────────────────────────── Parsing helpers ─────────────────────────
     def _fetch_listing(self, scraper: cloudscraper.CloudScraper, url: str) -> list[tuple[str, str]]:
-        soup = BeautifulSoup(self._get_html(scraper, url), "html.parser")
-        table = soup.find("table", class_="table-list")
-        if not table:
+        # 목록은 신제품 반영을 위해 항상 새로 받음 (캐시 X)
+        tables = _LISTING_TABLE_X(_parse_html(self._download(scraper, url)))
+        if not tables:
             _logger.warning("Listing table not found: %s", url)
             return []
         items: list[tuple[str, str]] = []
-        for row in table.select("tbody tr"):
-            anchor = row.find("a")
-            if anchor and anchor.get("href"):
-                name = anchor.get_text(strip=True)
-                href = anchor["href"].lstrip("/")
+        for row in _LISTING_ROW_X(tables[0]):
+            anchor = row.find(".//a")
+            if anchor is not None and anchor.get("href"):
+                name = _text(anchor)
+                href = anchor.get("href").lstrip("/")
                 items.append((name, f"https://nanoreview.net/{href}"))
         return items
 
     @staticmethod
     def _parse_metric_card(card_node) -> list[tuple[str, str]]:  # type: ignore[valid-type]
         results: list[tuple[str, str]] = []
-        for bar in card_node.select(BAR_SELECTOR):
-            metric = bar.select_one(NAME_SELECTOR).get_text(strip=True)
-            score = bar.select_one(VALUE_SELECTOR).get_text(strip=True)
+        for bar in _BAR_X(card_node):
+            metric = _text(_NAME_X(bar)[0])
+            score = _text(_VALUE_X(bar)[0])
             results.append((metric, score))
         return results
 
-    def _parse_metrics(self, html: str, card_titles: Iterable[str]) -> dict[str, str]:
-        soup = BeautifulSoup(html, "html.parser")
+    def _parse_metrics(self, tree, card_titles: Iterable[str]) -> dict[str, str]:  # type: ignore[no-untyped-def]
+        # h3 제목 → 노드 색인을 한 번만 만들고 제목별로는 O(1) 조회
+        headers = _index_by_text(_CARD_TITLE_X(tree))
+
         metrics: dict[str, str] = {}
         for title in card_titles:
-            header = soup.find("h3", class_="title-h2", string=title)
-            if not header:
+            header = headers.get(title)
+            cards = _CARD_X(header) if header is not None else None
+            if not cards:
                 continue
-            card = header.find_parent("div", class_="card")
-            for metric, score in self._parse_metric_card(card):
+            for metric, score in self._parse_metric_card(cards[0]):
                 metrics[metric] = score
         return metrics
 
-    def _parse_fps_table(self, html: str) -> Mapping[str, str]:
-        soup = BeautifulSoup(html, "html.parser")
-        caption = soup.find("caption", class_="title-h3", string=FPS_TABLE_CAPTION)
-        if not caption:
+    def _parse_fps_table(self, tree) -> Mapping[str, str]:  # type: ignore[no-untyped-def]
+        caption = _index_by_text(_FPS_CAPTION_X(tree)).get(FPS_TABLE_CAPTION)
+        tables = _FPS_TABLE_X(caption) if caption is not None else None
+        if not tables:
             return {}
-        table = caption.find_parent("table", class_="specs-table")
         fps: dict[str, str] = {}
-        for row in table.select(FPS_ROW_SEL):
-            res = row.select_one(FPS_RESOLUTION_SEL).get_text(strip=True)
-            val = row.select_one(FPS_VALUE_SEL).get_text(strip=True)
+        for row in _FPS_ROW_X(tables[0]):
+            res = _text(_FPS_RESOLUTION_X(row)[0])
+            val = _text(_FPS_VALUE_X(row)[0])
             fps[res] = val
         return fps
 
     # ───────────────────────────── Category crawl ──────────────────────────
-    def _crawl_one_category(self, cfg: CategoryConfig) -> None:
-        scraper = self._create_scraper()
+    def _fetch_and_parse(
+        self,
+        scraper: cloudscraper.CloudScraper,
+        cfg: CategoryConfig,
+        detail_url: str,
+        limiter: RateLimiter | None = None,
+    ) -> dict[str, str]:
+        """Fetch one detail page and return its metrics."""
+        tree = _parse_html(self._get_html(scraper, detail_url, limiter))  # 페이지당 1회 파싱
+        metrics = self._parse_metrics(tree, cfg.metric_cards)
+
+        # GPU: merge FPS metrics
+        if cfg.name == "GPU":
+            for res, value in self._parse_fps_table(tree).items():
+                metrics[f"Average FPS by {res}"] = value
+        return metrics
+
+    def _crawl_one_category(self, cfg: CategoryConfig, min_interval: float = MIN_REQUEST_INTERVAL) -> None:
+        # Pool initializer 가 만든 프로세스 전역 scraper 재사용 (Cloudflare 챌린지 1회)
+        scraper = _SCRAPER if _SCRAPER is not None else self._create_scraper()
         _logger.info("[%s] Listing scrape …", cfg.name)
         listing = self._fetch_listing(scraper, cfg.url)
         _logger.info("[%s] %d items found", cfg.name, len(listing))
 
         total = len(listing)
         step = max(1, total // 20)
-        rows: list[list[str]] = []
+        written = 0
         start = time.perf_counter()
-
-        for idx, (comp_name, detail_url) in enumerate(listing, 1):
-            time.sleep(random.uniform(1.0, 2.0))  # polite delay
-            try:
-                html = self._get_html(scraper, detail_url)
-                metrics = self._parse_metrics(html, cfg.metric_cards)
-
-                # GPU: merge FPS metrics
-                if cfg.name == "GPU":
-                    for res, value in self._parse_fps_table(html).items():
-                        metrics[f"Average FPS by {res}"] = value
-
-                row = [cfg.name, comp_name] + [metrics.get(col, "") for col in cfg.csv_columns[2:]]
-                rows.append(row)
-                # _logger.debug("%s scraped", comp_name)
-            except Exception as exc:  # pylint: disable=broad-except
-                _logger.error("[%s] %s failed: %s", cfg.name, comp_name, exc, exc_info=True)
-
-            # -------- 진행상황 로그 -------------
-            if idx % step == 0 or idx == total:
-                pct = idx / total * 100  # 0-100 %
-                elapsed = time.perf_counter() - start
-                _logger.info("[%s] %.1f %% (%d/%d) – %.0f s 경과",cfg.name, pct, idx, total, elapsed)
+        limiter = RateLimiter(min_interval)  # 카테고리 프로세스 몫의 요청 간격
 
         out_dir = RAW_DIR / cfg.out_subdir
         out_dir.mkdir(parents=True, exist_ok=True)
         out_path = out_dir / f"{cfg.name}_benchmark.csv"
-        self._write_csv(out_path, cfg.csv_columns, rows)
-        _logger.info("[%s] Written %d records → %s", cfg.name, len(rows), out_path)
 
-    # ───────────────────────────── CSV helper ──────────────────────────────
-    @staticmethod
-    def _write_csv(path: Path, headers: Sequence[str], rows: Iterable[Sequence[str]]) -> None:
-        with path.open("w", newline="", encoding="utf8") as fp:
+        # 결과를 받는 즉시 한 줄씩 기록 → 메모리 일정, 중단되어도 진행분 보존
+        # 카테고리 자체가 Pool(데몬) 프로세스에서 돌기 때문에 중첩 프로세스 풀은
+        # 불가 → 같은 API 의 ThreadPool 사용 (I/O 대기 중심이라 충분)
+        tasks = ((cfg, comp_name, detail_url) for comp_name, detail_url in listing)
+        with out_path.open("w", newline="", encoding="utf8") as fp, \
+                ThreadPool(DETAIL_WORKERS, initializer=_init_detail_worker, initargs=(self, limiter)) as pool:
             writer = csv.writer(fp)
-            writer.writerow(headers)
-            writer.writerows(rows)
+            writer.writerow(cfg.csv_columns)
+
+            results = pool.imap_unordered(_scrape_one_product, tasks, chunksize=DETAIL_CHUNKSIZE)
+            for idx, (_, row) in enumerate(results, 1):
+                if row is not None:
+                    writer.writerow(row)
+                    written += 1
+                    if written % CSV_FLUSH_EVERY == 0:
+                        fp.flush()
+
+                # -------- 진행상황 로그 -------------
+                if idx % step == 0 or idx == total:
+                    pct = idx / total * 100  # 0-100 %
+                    elapsed = time.perf_counter() - start
+                    _logger.info("[%s] %.1f %% (%d/%d) – %.0f s 경과",cfg.name, pct, idx, total, elapsed)
+
+        _logger.info("[%s] Written %d records → %s", cfg.name, written, out_path)
 
     # ───────────────────────────── Public API ──────────────────────────────
     def crawl(self, processes: int | None = None) -> None:
         """Crawl all configured categories using a process pool."""
-        worker_count = processes if processes is not None else max(cpu_count() // 2, 1)
-        _logger.info("Starting crawl with %d worker(s)…", worker_count)
+        requested = processes if processes is not None else max(cpu_count() // 2, 1)
+        # 카테고리당 프로세스 1개면 충분 - 그 이상은 유휴 프로세스만 늘어남
+        worker_count = max(1, min(requested, len(self.categories), MAX_CATEGORY_PROCESSES))
+        _logger.info(
+            "Starting crawl with %d worker(s)… (requested %d, capped by %d categories / max %d)",
+            worker_count, requested, len(self.categories), MAX_CATEGORY_PROCESSES,
+        )
         t0 = time.perf_counter()
 
-        with Pool(worker_count) as pool:
-            pool.map(self._crawl_one_category, self.categories)
+        # 동시에 도는 카테고리 프로세스끼리 요청 예산을 나눠 가짐 → 전체 ~1 req/s 유지
+        interval = MIN_REQUEST_INTERVAL * worker_count
+        with Pool(worker_count, initializer=_init_worker) as pool:
+            pool.starmap(self._crawl_one_category, ((cfg, interval) for cfg in self.categories))
 
         _logger.info("elapsed %.1f s - all categories done",time.perf_counter() - t0)
 
+###############################################################################
+# Pool workers (module-level so the pools can dispatch them)                  #
+###############################################################################
+
+_SCRAPER: cloudscraper.CloudScraper | None = None  # 카테고리 프로세스별 scraper
+_WORKER = threading.local()  # 워커 스레드별 crawler / scraper / limiter
+
+
+def _init_worker() -> None:
+    """Process-pool initializer: build the scraper once per process."""
+    global _SCRAPER
+    _SCRAPER = NanoreviewBenchmarkCrawler._create_scraper()
+
+
+def _init_detail_worker(crawler: NanoreviewBenchmarkCrawler, limiter: RateLimiter) -> None:
+    """Thread-pool initializer: one scraper per worker (Session is not thread-safe)."""
+    _WORKER.crawler = crawler
+    _WORKER.scraper = crawler._create_scraper()
+    if _SCRAPER is not None:
+        # 프로세스 scraper 의 Cloudflare 쿠키/UA 를 물려받아 챌린지 재풀이 방지
+        _WORKER.scraper.headers.update(_SCRAPER.headers)
+        _WORKER.scraper.cookies.update(_SCRAPER.cookies)
+    _WORKER.limiter = limiter
+
+
+def _scrape_one_product(args: tuple[CategoryConfig, str, str]) -> tuple[str, tuple[str, ...] | None]:
+    """Fetch + parse one product; returns ``(name, csv_row)`` or ``(name, None)`` on failure."""
+    cfg, comp_name, detail_url = args
+    try:
+        metrics = _WORKER.crawler._fetch_and_parse(_WORKER.scraper, cfg, detail_url, _WORKER.limiter)
+        # _logger.debug("%s scraped", comp_name)
+        return comp_name, (cfg.name, comp_name, *(metrics.get(col, "") for col in cfg.csv_columns[2:]))
+    except Exception as exc:  # pylint: disable=broad-except
+        _logger.error("[%s] %s failed: %s", cfg.name, comp_name, exc, exc_info=True)
+        return comp_name, None
+
 ###############################################################################
 # Script entry‑point                                                          #
 ###############################################################################
 
 if __name__ == "__main__":
-    NanoreviewBenchmarkCrawler().crawl(processes=2)
+    ap = argparse.ArgumentParser(description="Crawl CPU/GPU benchmark scores from nanoreview.net")
+    ap.add_argument("--refresh", action="store_true",
+                    help="Ignore the HTML cache in data/cache and re-download every detail page")
+    args = ap.parse_args()
+
+    NanoreviewBenchmarkCrawler(refresh=args.refresh).crawl(processes=2)
@@ -2,15 +2,20 @@
 """
 Danawa 가상견적 페이지 크롤러
 * 단일 카테고리 → Product 리스트 수집
-* 다중 프로세스 병렬 처리 지원
+* 다중 스레드 병렬 처리 지원 (카테고리별 WebDriver 1개)
+
+참고: 상품 목록은 페이지 내부 XHR 로 채워진다. 이 요청을 requests 로 직접
+호출하면 Chrome 없이 수집할 수 있지만, 엔드포인트와 폼 필드(카테고리 seq,
+체크박스 옵션 seq)는 DevTools 로 실제 요청을 캡처해야만 확정된다. 확인 전까지는
+Selenium 경로를 유지하고, 브라우저 왕복 비용은 수집 단계에서 줄인다.
 """
 
 import csv
-import time
 import traceback
 import logging
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from multiprocessing import Pool, cpu_count
+from multiprocessing import cpu_count
 from pathlib import Path
 from typing import Iterable, List, Tuple
 
@@ -107,6 +112,66 @@ CHECKBOX_OPTIONS: dict[str, list[str]] = {
     "케이스": ["ATX 케이스", "M-ATX 케이스", "미니ITX", "튜닝 케이스"],
     "파워": ["ATX 파워", "M-ATX(SFX) 파워", "TFX 파워"],
 }
+LIST_CONTAINER_CSS = "div.list_tbl_wrap.admd_tbl_wrap.estimate_renew_list"
+LIST_TABLE_CSS = f"{LIST_CONTAINER_CSS} div.scroll_box > table.tbl_list"
+LIST_QUIET_MS = 200  # 이 시간 동안 DOM 변화가 없으면 목록 로딩 완료로 간주
+
+# 목록 컨테이너에 MutationObserver 설치 → window.__listStable 플래그로 완료 신호
+# (페이지 이동 시 table 자체가 교체되므로 tbody 가 아니라 상위 컨테이너를 관찰)
+_LIST_OBSERVER_JS = """
+const target = document.querySelector(arguments[0]) || document.body;
+const quietMs = arguments[1];
+window.__listSettle = () => {
+  clearTimeout(window.__listTimer);
+  window.__listStable = false;
+  window.__listTimer = setTimeout(() => { window.__listStable = true; }, quietMs);
+};
+if (window.__listObserver) window.__listObserver.disconnect();
+window.__listObserver = new MutationObserver(window.__listSettle);
+window.__listObserver.observe(target, {childList: true, subtree: true});
+window.__listSettle();
+"""
+_LIST_STABLE_JS = (
+    "return window.__listStable === true"
+    " && document.querySelectorAll(arguments[0]).length > 0;"
+)
+
+# 체크박스 XPath 템플릿 - 라벨은 xpath_literal() 로 안전하게 인용
+_CHECKBOX_XPATH = "//input[@type='checkbox' and normalize-space(@data)={}]"
+
+# 전달받은 체크박스 요소들 중 아직 안 체크된 것만 클릭(라벨당 1회)하고 체크된 라벨 목록 반환
+# (checked 확인 → 재실행/재시도해도 이미 켠 필터를 다시 끄지 않음)
+_BATCH_CLICK_JS = """
+const clicked = new Set();
+for (const el of arguments[0]) {
+  const key = el.getAttribute("data").replace(/\\s+/g, " ").trim();
+  if (!clicked.has(key)) {
+    clicked.add(key);
+    if (!el.checked) el.click();
+  }
+}
+return [...clicked];
+"""
+
+def xpath_literal(text: str) -> str:
+    """작은/큰따옴표가 섞여 있어도 안전한 XPath 문자열 리터럴 생성"""
+    if "'" not in text:
+        return f"'{text}'"
+    if '"' not in text:
+        return f'"{text}"'
+    return "concat(" + ", \"'\", ".join(f"'{part}'" for part in text.split("'")) + ")"
+
+# 페이지의 모든 행을 브라우저에서 dict 배열로 변환해 1회 왕복으로 반환
+# (Selenium .text 와 동일하게 innerText, src 는 절대 URL)
+_ROWS_JSON_JS = """
+return [...document.querySelectorAll(arguments[0])].map(tr => ({
+  pid: tr.className.split("_").pop(),
+  name: tr.querySelector("td.title_price p.subject a")?.innerText.trim() ?? null,
+  img: tr.querySelector("td.goods_img img")?.src.split("?")[0] ?? null,
+  spec: tr.querySelector("td.title_price div.spec_wrap a")?.innerText.replace(/\\n/g, " / ").trim() ?? null,
+}));
+"""
+
 # -------------------------------------------------------
 # 데이터 모델
 # -------------------------------------------------------
@@ -132,9 +197,16 @@ class VirtualEstimateCrawler:
         options.add_argument("--disable-gpu")
         options.add_argument("--no-sandbox")
         options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--window-size=1920,1080")
+        options.add_argument("--window-size=1280,800")
         options.add_argument('--start-maximized')  # 최대화 모드로 시작
         options.add_argument("lang=ko_KR")
+        # DOM 텍스트/속성만 사용 → 이미지·웹폰트 로딩 차단 (src 속성은 그대로 남음)
+        # 스타일시트는 유지: 오버레이/버튼 대기가 CSS 가시성(display)에 의존
+        options.add_argument("--blink-settings=imagesEnabled=false")
+        options.add_experimental_option("prefs", {
+            "profile.managed_default_content_settings.images": 2,
+            "profile.managed_default_content_settings.fonts": 2,
+        })
 
         self.driver = Chrome(service = Service(str(DRIVER_PATH)), options=options)
         self.wait = WebDriverWait(self.driver, 10)
@@ -148,6 +220,7 @@ class VirtualEstimateCrawler:
 
             # 1. 탭 이동
             self._click_category_tab(category_name)
+            self._install_list_observer()
 
             # 2. 옵션 필터링
             self._click_checkboxes(CHECKBOX_OPTIONS.get(category_name, []))
@@ -176,6 +249,9 @@ class VirtualEstimateCrawler:
         # 로딩 오버레이가 사라질 때까지 대기
         self.wait.until(EC.invisibility_of_element_located((By.CSS_SELECTOR, ".product_list_cover")))
 
+    def _install_list_observer(self) -> None:
+        self.driver.execute_script(_LIST_OBSERVER_JS, LIST_CONTAINER_CSS, LIST_QUIET_MS)
+
     def _click_checkboxes(self, labels: Iterable[str]) -> None:
         """
         옵션 패널 열기 → '더보기' 전부 펼치기 → 원하는 체크박스 클릭
@@ -231,20 +307,42 @@ class VirtualEstimateCrawler:
                 logger.debug("[옵션 더보기] 클릭 예외: %s", e)
                 continue
 
-        # 실제 체크박스 클릭
+        # 실제 체크박스 클릭 - (1) 합친 XPath 1회 조회 + JS 1회 일괄 클릭
+        labels = list(labels)
+        clicked: set[str] = set()
+        try:
+            xpath = " | ".join(_CHECKBOX_XPATH.format(xpath_literal(label)) for label in labels)
+            elements = self.driver.find_elements(By.XPATH, xpath)
+            clicked = set(self.driver.execute_script(_BATCH_CLICK_JS, elements))
+        except Exception as e:
+            logger.debug("[필터] 일괄 체크 실패: %s", e)
+
+        # (2) 오버레이 대기 - 클릭은 이미 반영됨 → 실패해도 로그만 (재클릭으로 넘기지 않음)
+        if clicked:
+            try:
+                self.wait.until(
+                    EC.invisibility_of_element_located((By.CSS_SELECTOR, ".product_list_cover"))
+                )
+            except TimeoutException:
+                logger.debug("[필터] 일괄 체크 후 오버레이 대기 시간 초과")
+            logger.debug("[필터] %d개 일괄 체크 완료", len(clicked))
+
+        # (3) 일괄 경로에서 찾지 못한 라벨만 개별 클릭으로 재시도
+        missing = [label for label in labels if label not in clicked]
+        if missing:
+            self._click_checkboxes_one_by_one(missing)
+
+    def _click_checkboxes_one_by_one(self, labels: Iterable[str]) -> None:
+        """일괄 클릭에서 찾지 못한 라벨용 개별 클릭 경로 (이미 체크된 박스는 건드리지 않음)"""
         for label in labels:
             try:
                 check = self.wait.until(
                     EC.presence_of_element_located(
-                        (
-                            By.XPATH,
-                            f"//input[@type='checkbox' and normalize-space(@data)='{label}']",
-                        )
+                        (By.XPATH, _CHECKBOX_XPATH.format(xpath_literal(label)))
                     )
                 )
                 self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", check)
-                time.sleep(0.15)  # 스크롤 안정화
-                self.driver.execute_script("arguments[0].click();", check)
+                self.driver.execute_script("if (!arguments[0].checked) arguments[0].click();", check)
                 self.wait.until(
                     EC.invisibility_of_element_located((By.CSS_SELECTOR, ".product_list_cover"))
                 )
@@ -252,12 +350,10 @@ class VirtualEstimateCrawler:
             except Exception as e:
                 logger.debug("[필터] '%s' 체크 실패: %s", label, e)
 
-
     def _collect_products(self, category_name: str) -> list[Product]:
         products = []
         page = 1
-        container_css = "div.list_tbl_wrap.admd_tbl_wrap.estimate_renew_list"
-        table_css = f"{container_css} div.scroll_box > table.tbl_list"
+        table_css = LIST_TABLE_CSS
 
         old_table = None  # staleness 감시용
 
@@ -272,64 +368,26 @@ class VirtualEstimateCrawler:
             )
             self._wait_rows_stable(table_css)
 
-            rows = self.driver.find_elements(By.CSS_SELECTOR, f"{table_css} tbody tr")
+            # 3) 행 데이터를 JS 에서 한 번에 추출 (행마다 driver 왕복 X, stale 불가)
+            rows = self.driver.execute_script(_ROWS_JSON_JS, f"{table_css} tbody tr")
             logger.debug(f"[{category_name}] {page}페이지 행 {len(rows)}개 발견")
 
-            for idx in range(len(rows)):
-                try:
-                    row = rows[idx]  # 인덱스로 재확보하면 stale 최소화
-                    pid = row.get_attribute("class").split("_")[-1]
-                    name = row.find_element(
-                        By.CSS_SELECTOR, "td.title_price p.subject a"
-                    ).text.strip()
-                    image = (
-                        row.find_element(By.CSS_SELECTOR, "td.goods_img img")
-                        .get_attribute("src")
-                        .split("?")[0]
-                    )
-                    spec = (
-                        row.find_element(By.CSS_SELECTOR, "td.title_price div.spec_wrap a")
-                        .text.replace("\n", " / ").strip()
-                    )
-                    products.append(
-                        Product(pid, name, spec, image, f"https://prod.danawa.com/info/?pcode={pid}")
-                    )
-                except StaleElementReferenceException:
-                    # ------- 재시도 로직 (동일 코드) --------------
-                    try:
-                        fresh_row = self.driver.find_elements(
-                            By.CSS_SELECTOR, f"{table_css} tbody tr"
-                        )[idx]
-                        pid = fresh_row.get_attribute("class").split("_")[-1]
-                        name = fresh_row.find_element(
-                            By.CSS_SELECTOR, "td.title_price p.subject a"
-                        ).text.strip()
-                        image = (
-                            fresh_row.find_element(By.CSS_SELECTOR, "td.goods_img img")
-                            .get_attribute("src")
-                            .split("?")[0]
-                        )
-                        spec = (
-                            fresh_row.find_element(By.CSS_SELECTOR, "td.title_price div.spec_wrap a")
-                            .text.replace("\n", " / ").strip()
-                        )
-                        products.append(
-                            Product(pid, name, spec, image, f"https://prod.danawa.com/info/?pcode={pid}")
-                        )
-                        logger.debug(f"{pid} (retry) 수집")
-                    except Exception as retry_err:
-                        logger.debug(f"행 재시도 실패: {retry_err!r}")
-                        continue
-                except Exception as any_err:
-                    logger.debug(f"행 스킵: {any_err!r}")
+            for row in rows:
+                pid, name, image, spec = row["pid"], row["name"], row["img"], row["spec"]
+                if not pid or name is None or image is None or spec is None:
+                    logger.debug(f"행 스킵: {row!r}")
                     continue
+                products.append(
+                    Product(pid, name, spec, image, f"https://prod.danawa.com/info/?pcode={pid}")
+                )
 
-            # 3) 다음 페이지 이동
+            # 4) 다음 페이지 이동 (클릭만 Selenium)
             try:
                 next_btn = self.driver.find_element(
                     By.CSS_SELECTOR,
                     ".paging_estimate li.pagination-box__item.pagination--now + li a",
                 )
+                self.driver.execute_script("window.__listSettle && window.__listSettle();")
                 next_btn.click()
                 page += 1
                 old_table = table  # 방금 사용한 테이블을 staleness 대상 지정
@@ -338,22 +396,17 @@ class VirtualEstimateCrawler:
 
         return products
 
-    def _wait_rows_stable(self, table_css: str, timeout: int = 10, interval: float = 0.3):
+    def _wait_rows_stable(self, table_css: str, timeout: int = 10):
         """
-        테이블 tr 개수가 '두 번 연속 동일'할 때까지 대기.
-        Lazy-loading 이 끝났다고 간주.
+        MutationObserver 가 LIST_QUIET_MS 동안 변화를 감지하지 않고 행이 1개 이상이면
+        Lazy-loading 이 끝났다고 간주. (고정 간격 행 개수 비교 대신 이벤트 기반)
         """
-        end_time = time.time() + timeout
-        prev_cnt = -1
-        while time.time() < end_time:
-            curr_cnt = len(
-                self.driver.find_elements(By.CSS_SELECTOR, f"{table_css} tbody tr")
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=0.05).until(
+                lambda d: d.execute_script(_LIST_STABLE_JS, f"{table_css} tbody tr")
             )
-            if curr_cnt == prev_cnt and curr_cnt > 0:
-                return
-            prev_cnt = curr_cnt
-            time.sleep(interval)
-        raise TimeoutException("행 개수 안정 대기 timeout")
+        except TimeoutException:
+            raise TimeoutException("행 개수 안정 대기 timeout") from None
 
     def _save_to_csv(self, products: List[Product], code: str) -> None:
         raw_dir = BASE_DIR / "data" / "raw" / code
@@ -366,15 +419,24 @@ class VirtualEstimateCrawler:
             writer.writerows(prod.as_csv_row() for prod in products)
 
 # -------------------------------------------------------
-# 멀티 프로세싱 진입
+# 멀티 스레드 진입
 # -------------------------------------------------------
 def _worker(category: Tuple[str, str]) -> None:
     name, code = category
     VirtualEstimateCrawler().crawl(name, code)
 
-def main(processes: int = max(cpu_count() // 2, 1)) -> None:
-    with Pool(processes) as pool:
-        pool.map(_worker, CATEGORIES)
+def main(processes: int = min(4, len(CATEGORIES), max(cpu_count() // 2, 1))) -> None:
+    """
+    카테고리별 크롤링을 스레드 풀로 병렬 실행.
+    워커 1개 = Chrome 1개(~200MB) 이므로 기본값은 최대 4개로 제한한다.
+    그 이상은 메모리 스왑/디스크 스래싱으로 오히려 느려진다.
+    """
+    # 작업은 chromedriver 소켓 대기(I/O) 위주 → 프로세스 대신 스레드
+    # (각 스레드가 자기 Chrome 을 소유하므로 pickling/IPC 불필요)
+    logger.info("워커 %d개로 시작 (카테고리 %d개, CPU %d개, Chrome 메모리 고려 상한 4)",
+                processes, len(CATEGORIES), cpu_count())
+    with ThreadPoolExecutor(max_workers=processes) as ex:
+        list(ex.map(_worker, CATEGORIES))
     print("모든 카테고리 크롤링이 완료되었습니다.")
 
 if __name__ == "__main__":
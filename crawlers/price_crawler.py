@@ -1,11 +1,28 @@
 # -*- coding: utf-8 -*-
+"""
+Danawa 카테고리 리스트 가격 크롤러
+* 카테고리 필터 적용 → (상품 ID, 가격) 수집 → <code>_price.csv 저장
+* BrowserPool 로 Chrome 재사용, 카테고리는 스레드 병렬 처리
+
+참고: 리스트는 페이지 내부 AJAX(getProductList.ajax.php)로 채워진다. 이를 직접
+호출하면 Selenium 없이 수집할 수 있지만, 필터 체크박스에 대응하는 요청 파라미터
+값은 DevTools 로 실제 요청을 캡처해야만 확정된다. 확인 전까지는 Selenium 경로를
+유지한다.
+"""
 
 import csv
+import functools
+import json
+import os
+import queue
+import shutil
+import tempfile
+import threading
 import time
 import traceback
 import logging
-from dataclasses import dataclass
-from multiprocessing import Pool, cpu_count
+from concurrent.futures import ThreadPoolExecutor
+from multiprocessing import cpu_count
 from pathlib import Path
 from typing import Iterable, List, Tuple
 
@@ -19,7 +36,6 @@ from selenium.common.exceptions import (
     StaleElementReferenceException,
     NoSuchElementException,
     TimeoutException,
-    ElementClickInterceptedException,
 )
 
 # -------- 로깅 설정 ---------------------
@@ -33,6 +49,33 @@ logger.addHandler(_stream)
 BASE_DIR = Path(__file__).resolve().parent.parent
 # DRIVER_PATH = BASE_DIR / "driver" / "chromedriver.exe"
 DRIVER_PATH = BASE_DIR / "driver" / "chromedriver"
+_DRIVER_PATH_STR = str(DRIVER_PATH)  # Service 생성마다 경로 변환 생략
+# Chrome 프로필은 tmpfs(/dev/shm) 에 두고 삭제하지 않음 → 프로필 I/O 는 메모리,
+# HTTP/정적 리소스 캐시는 카테고리 간·재실행 간 재사용 (풀 슬롯 번호별 1개)
+PROFILE_ROOT = Path("/dev/shm" if os.path.isdir("/dev/shm") else tempfile.gettempdir())
+PROFILE_DISK_CACHE_BYTES = 64 << 20  # 슬롯당 HTTP 캐시 상한 (/dev/shm 은 RAM)
+# headless 빠른 기동용: 백그라운드 네트워크/동기화/확장 등 불필요한 초기화 차단
+FAST_BOOT_ARGS = (
+    "--disable-background-networking",
+    "--disable-background-timer-throttling",
+    "--disable-client-side-phishing-detection",
+    "--disable-default-apps",
+    "--disable-extensions",
+    "--disable-hang-monitor",
+    "--disable-popup-blocking",
+    "--disable-sync",
+    "--metrics-recording-only",
+    "--no-first-run",
+    "--safebrowsing-disable-auto-update",
+)
+CSV_FLUSH_BYTES = 1 << 20  # _save_to_csv 버퍼 1 MiB 마다 write
+BROWSER_RECYCLE_AFTER = 20  # 드라이버 1개당 카테고리 N개 처리 후 재시작 (메모리 누수 방지)
+BROWSER_ACQUIRE_TIMEOUT = 600.0  # BrowserPool.acquire 최대 대기 (s)
+
+OPTION_CACHE_PATH = BASE_DIR / "data" / "raw" / ".option_cache.json"  # 카테고리별 '더보기' 패널 id
+
+# 가격 문자열에서 콤마/공백/nbsp 제거용 translate 테이블 ("1,234,000" → "1234000")
+_DIGITS_ONLY = str.maketrans("", "", ", \xa0")
 
 CATEGORY_URLS  = {
     "CPU": "https://prod.danawa.com/list/?cate=112747",
@@ -110,29 +153,258 @@ CHECKBOX_OPTIONS: dict[str, list[str]] = {
     "파워": ["ATX 파워", "M-ATX(SFX) 파워", "TFX 파워"],
 }
 
-# --------- 데이터 모델 --------------------
-@dataclass(slots=True)
-class PriceEntry:
-    pid: str
-    price: int | None
+# ----------- 브라우저 측 일괄 처리 JS ---------------
+# 닫혀 있는 옵션 패널의 '더보기' 버튼을 한 번에 모두 클릭하고 클릭 수 반환
+_EXPAND_MORE_JS = """
+const buttons = arguments[0].querySelectorAll(arguments[1]);
+buttons.forEach(btn => btn.click());
+return buttons.length;
+"""
+_EXPAND_DONE_JS = "return arguments[0].querySelectorAll(arguments[1]).length === 0;"
+
+# 펼쳐진(show_sub_item) dd 를 가진 dl 의 id 목록 → 옵션 캐시에 저장
+_EXPANDED_IDS_JS = """
+return [...arguments[0].querySelectorAll("dl.spec_item")]
+  .filter(dl => dl.id && dl.querySelector("dd.item_dd.show_sub_item"))
+  .map(dl => dl.id);
+"""
+
+# label[title=...] 내부 체크박스를 한 번에 체크하고, 찾은 라벨 목록 반환
+_CHECK_LABELS_JS = """
+const found = [];
+for (const t of arguments[0]) {
+  const lbl = document.querySelector(`label[title="${CSS.escape(t)}"]`);
+  const cb = lbl && lbl.querySelector("input[type=checkbox]");
+  if (!cb) continue;
+  if (!cb.checked) cb.click();
+  found.push(t);
+}
+return found;
+"""
+
+# 리스트가 quiet_ms 동안 변경(mutation) 없으면 아이템 수를 콜백으로 반환
+# (Python 측은 execute_async_script 1회 호출로 블로킹 - 폴링 없음)
+_WAIT_QUIET_JS = """
+const [listCss, itemCss, quietMs] = arguments;
+const done = arguments[arguments.length - 1];
+const target = document.querySelector(listCss);
+if (!target) return done(-1);
+let obs;
+const settle = () => {
+  obs.disconnect();
+  done(target.querySelectorAll(itemCss).length);
+};
+let timer = setTimeout(settle, quietMs);
+obs = new MutationObserver(() => {
+  clearTimeout(timer);
+  timer = setTimeout(settle, quietMs);
+});
+obs.observe(target, {childList: true, subtree: true});
+"""
+
+# movePage(n) 링크를 찾아 페이지 내부에서 바로 클릭 (없으면 false → 마지막 페이지)
+# 필터가 AJAX 상태로만 유지되므로 URL 재요청 대신 사이트의 페이지 이동 로직을 그대로 사용
+_MOVE_PAGE_JS = """
+const link = document.evaluate(
+  `//a[contains(@onclick, 'movePage(${arguments[0]})')]`, document, null,
+  XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+if (!link) return false;
+link.click();
+return true;
+"""
+
+# ------------- 옵션 패널 캐시 --------------------
+# { cat_name: [dl id, ...] } - 재실행 시 전체 탐색 대신 캐시된 패널만 펼친다
+_OPTION_CACHE_LOCK = threading.Lock()
+
+def _load_option_cache() -> dict[str, list[str]]:
+    try:
+        with OPTION_CACHE_PATH.open(encoding="utf-8") as fp:
+            return json.load(fp)
+    except (OSError, ValueError):
+        return {}
+
+def _update_option_cache(cat_name: str, panel_ids: list[str] | None) -> None:
+    """panel_ids=None 이면 해당 카테고리 캐시 무효화"""
+    with _OPTION_CACHE_LOCK:
+        cache = _load_option_cache()
+        if panel_ids is None:
+            if cache.pop(cat_name, None) is None:
+                return
+        else:
+            cache[cat_name] = panel_ids
+        OPTION_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        fd, tmp = tempfile.mkstemp(dir=OPTION_CACHE_PATH.parent, suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as fp:
+            json.dump(cache, fp, ensure_ascii=False, indent=2)
+        os.replace(tmp, OPTION_CACHE_PATH)
+
+# ------------- 재시도 --------------------
+def retry_on_stale(max_attempts: int = 3, backoff: float = 0.05):
+    """
+    StaleElementReferenceException 발생 시 함수 전체를 다시 실행
+    * 감싼 함수는 요소를 스스로 다시 조회하는(멱등) 형태여야 한다
+    """
+    def deco(fn):
+        @functools.wraps(fn)
+        def wrap(*args, **kwargs):
+            for attempt in range(max_attempts):
+                try:
+                    return fn(*args, **kwargs)
+                except StaleElementReferenceException:
+                    if attempt == max_attempts - 1:
+                        raise
+                    logger.debug("[stale] %s 재시도 %d", fn.__name__, attempt + 1)
+                    time.sleep(backoff * (attempt + 1))
+        return wrap
+    return deco
+
+# ------------- 브라우저 풀 --------------------
+def _make_chrome(slot: int) -> Chrome:
+    options = ChromeOptions()
+    options.page_load_strategy = "eager"  # DOMContentLoaded 까지만 대기 (이미지 등 하위 리소스 무시)
+    options.add_argument("--headless")
+    options.add_argument("--disable-gpu")
+    options.add_argument("--no-sandbox")
+    options.add_argument("--disable-dev-shm-usage")
+    options.add_argument("--window-size=1920,1080")
+    options.add_argument('--start-maximized')  # 최대화 모드로 시작
+    options.add_argument("lang=ko_KR")
+    for arg in FAST_BOOT_ARGS:
+        options.add_argument(arg)
+    # 슬롯마다 별도 프로필 - 동시에 뜬 Chrome 끼리 프로필 잠금을 다투지 않도록
+    # (같은 슬롯은 한 번에 드라이버 1개만 사용: 재시작 시 이전 드라이버 종료 후 생성)
+    profile_dir, is_temp = _claim_profile(slot)
+    options.add_argument(f"--user-data-dir={profile_dir}")
+    options.add_argument(f"--disk-cache-dir={profile_dir / 'cache'}")
+    options.add_argument(f"--disk-cache-size={PROFILE_DISK_CACHE_BYTES}")
+    # Service 는 chromedriver 프로세스 1개를 소유 → 드라이버 간 공유 불가, 매번 생성
+    try:
+        driver = Chrome(service = Service(_DRIVER_PATH_STR), options=options)
+    except Exception:
+        if is_temp:
+            shutil.rmtree(profile_dir, ignore_errors=True)
+        raise
+    driver.profile_slot = slot  # 재시작 시 같은 프로필(캐시) 재사용
+    driver.temp_profile = profile_dir if is_temp else None  # 종료 시 삭제할 임시 프로필
+    driver.implicitly_wait(0)  # 명시적 대기만 사용 (암묵 대기와 중첩 방지)
+    return driver
+
+def _claim_profile(slot: int) -> tuple[Path, bool]:
+    """
+    슬롯 고정 프로필 경로 반환 → (경로, 임시 여부)
+    * Chrome 의 SingletonLock(호스트명-pid 심볼릭 링크)으로 사용 중 여부 판단
+    * 잠금 pid 가 죽어 있으면(비정상 종료 잔재) 잠금 파일만 정리하고 재사용
+    * 다른 실행이 사용 중이면 이번 실행 전용 임시 프로필 (캐시 재사용 포기)
+    """
+    profile_dir = PROFILE_ROOT / f"danawa-profile-{slot}"
+    try:
+        pid = int(os.readlink(profile_dir / "SingletonLock").rsplit("-", 1)[1])
+    except (OSError, ValueError, IndexError):
+        return profile_dir, False  # 잠금 없음
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        for name in ("SingletonLock", "SingletonCookie", "SingletonSocket"):
+            try:
+                (profile_dir / name).unlink()
+            except OSError:
+                pass
+        logger.debug("[프로필] 슬롯 %d 의 낡은 잠금 정리 (pid %d)", slot, pid)
+        return profile_dir, False
+    except PermissionError:
+        pass  # 다른 사용자의 살아 있는 프로세스
+    logger.debug("[프로필] 슬롯 %d 사용 중 (pid %d) -> 임시 프로필 사용", slot, pid)
+    return Path(tempfile.mkdtemp(prefix=f"danawa-profile-{slot}-", dir=PROFILE_ROOT)), True
+
+class BrowserPool:
+    """
+    미리 띄워 둔 Chrome 드라이버를 빌려주고 돌려받는 스레드 안전 풀
+    * 카테고리마다 Chrome 을 새로 띄우는 비용(2~3초)을 풀 크기만큼만 지불
+    * 반납 시 쿠키/페이지 초기화, recycle_after 회 사용한 드라이버는 재시작
+    * 프로필(캐시)은 슬롯별로 PROFILE_ROOT 에 남겨 다음 실행에서도 재사용
+      (다른 실행이 같은 슬롯을 쓰는 중이면 임시 프로필 → 종료 시 삭제)
+    * 기동 중 하나라도 실패하면 이미 뜬 Chrome 을 종료하고 예외 전파
+    * 재시작 실패 시 슬롯만 줄이고 계속, 슬롯이 모두 사라지면 acquire 가 무한 대기 대신 RuntimeError
+    """
+
+    def __init__(self, size: int, recycle_after: int = BROWSER_RECYCLE_AFTER):
+        self.recycle_after = recycle_after
+        self._idle: queue.Queue[Chrome] = queue.Queue()
+        self._uses: dict[int, int] = {}
+        self._alive = 0  # 풀이 소유한 드라이버 수 (대여 중 포함)
+        self._lock = threading.Lock()
+        with ThreadPoolExecutor(max_workers=size) as ex:  # 기동 자체도 병렬
+            futures = [ex.submit(_make_chrome, slot) for slot in range(size)]
+        errors: list[Exception] = []
+        for fut in futures:
+            try:
+                self._idle.put(fut.result())
+                self._alive += 1
+            except Exception as e:
+                errors.append(e)
+        if errors:
+            # 일부만 뜬 경우 → 이미 뜬 Chrome 종료 후 실패 전파
+            self.close()
+            raise errors[0]
+
+    def acquire(self, timeout: float = BROWSER_ACQUIRE_TIMEOUT) -> Chrome:
+        with self._lock:
+            if self._alive == 0:
+                raise RuntimeError("BrowserPool: 사용 가능한 드라이버 없음 (재시작 모두 실패)")
+        try:
+            return self._idle.get(timeout=timeout)
+        except queue.Empty:
+            raise RuntimeError(f"BrowserPool: {timeout:.0f}초 안에 드라이버를 얻지 못함") from None
+
+    def release(self, driver: Chrome) -> None:
+        uses = self._uses.pop(id(driver), 0) + 1
+        # 사용 한도 도달 또는 초기화 실패(브라우저 죽음) → 새 드라이버로 교체
+        if uses >= self.recycle_after or not self._reset(driver):
+            slot = driver.profile_slot
+            self._quit(driver)
+            try:
+                driver, uses = _make_chrome(slot), 0
+            except Exception as e:
+                # 슬롯 소실 → 집계만 하고 반환 (카테고리 작업은 이미 끝남, 남은 드라이버로 계속)
+                # 드라이버가 모두 사라지면 acquire 가 즉시 RuntimeError
+                with self._lock:
+                    self._alive -= 1
+                    alive = self._alive
+                logger.error("[BrowserPool] 슬롯 %d 드라이버 재시작 실패 (남은 드라이버 %d개): %r", slot, alive, e)
+                return
+        self._uses[id(driver)] = uses
+        self._idle.put(driver)
+
+    def close(self) -> None:
+        while not self._idle.empty():
+            self._quit(self._idle.get_nowait())
 
-    def as_row(self) -> list[str | int]:
-        return [self.pid, self.price if self.price is not None else ""]
+    @staticmethod
+    def _reset(driver: Chrome) -> bool:
+        """다음 카테고리로 상태가 새지 않도록 쿠키/페이지 초기화"""
+        try:
+            driver.delete_all_cookies()
+            driver.get("about:blank")
+            return True
+        except Exception:
+            return False
+
+    @staticmethod
+    def _quit(driver: Chrome) -> None:
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        if getattr(driver, "temp_profile", None) is not None:
+            shutil.rmtree(driver.temp_profile, ignore_errors=True)
 
 # ------------- 크롤러 --------------------
 
 class PriceCrawler:
-    def __init__(self):
-        options = ChromeOptions()
-        options.add_argument("--headless")
-        options.add_argument("--disable-gpu")
-        options.add_argument("--no-sandbox")
-        options.add_argument("--disable-dev-shm-usage")
-        options.add_argument("--window-size=1920,1080")
-        options.add_argument('--start-maximized')  # 최대화 모드로 시작
-        options.add_argument("lang=ko_KR")
-
-        self.driver = Chrome(service = Service(str(DRIVER_PATH)), options=options)
+    def __init__(self, driver: Chrome):
+        # 드라이버 수명은 BrowserPool 이 관리 (여기서 생성/종료하지 않음)
+        self.driver = driver
         self.wait = WebDriverWait(self.driver, 10)
 
     # --------- public API -------------
@@ -142,26 +414,27 @@ class PriceCrawler:
             logger.info(f"[{cat_name}] 시작")
             self.driver.get(url)
 
-            self._click_checkboxes(CHECKBOX_OPTIONS.get(cat_name, []))
+            self._click_checkboxes(cat_name, CHECKBOX_OPTIONS.get(cat_name, []))
             self._select_90_per_page()
 
-            entries = self._collect_prices(cat_name)
-            self._save_to_csv(csv_code=cat_code, rows=entries)
+            pids, prices = self._collect_prices(cat_name)
+            self._save_to_csv(csv_code=cat_code, pids=pids, prices=prices)
 
-            logger.info(f"[{cat_name}] 완료 ({len(entries):,}개)")
+            logger.info(f"[{cat_name}] 완료 ({len(pids):,}개)")
 
         except Exception as err:
             logger.error(f"[{cat_name}] 실패: {err!r}")
             traceback.print_exc()
-        finally:
-            self.driver.quit()
 
-    def _click_checkboxes(self, labels: Iterable[str]) -> None:
+    def _click_checkboxes(self, cat_name: str, labels: Iterable[str]) -> None:
         """
         리스트 페이지용 필터 적용
         * <div id="extendSearchOptionpriceCompare"> 영역 내부만 다룸
         * 아직 show_sub_item 이 없는 item_dd 중, btn_view_more 버튼이
           존재하는 패널만 클릭해 옵션을 모두 펼친다.
+        * 펼친 패널 id 는 OPTION_CACHE_PATH 에 저장 → 다음 실행엔 해당 패널만 클릭
+          (라벨 체크박스가 하나라도 안 보이면 DOM 변경으로 보고 캐시 무효화 후
+          같은 실행에서 전체 펼치기 + 남은 라벨 체크를 다시 수행)
         """
         if not labels:
             return
@@ -176,59 +449,103 @@ class PriceCrawler:
             logger.warning("[옵션 전체보기] 클릭 실패 -> 필터 건너뜀: %s", e)
             return
 
-        # 2) <div id="extendSearchOptionpriceCompare"> 컨테이너 한정
+        # 2) <div id="extendSearchOptionpriceCompare"> 컨테이너 한정 → '더보기' 전부 펼치기
+        cached_ids = _load_option_cache().get(cat_name)
         try:
-            option_box = self.wait.until(
-                EC.presence_of_element_located(
-                    (By.CSS_SELECTOR, "div#extendSearchOptionpriceCompare")
-                )
-            )
+            panel_ids = self._expand_panels(cached_ids)
         except TimeoutException:
             logger.warning("[옵션 영역] 탐색 실패 -> 필터 건너뜀")
             return
+        except Exception as e:
+            logger.debug("[옵션 더보기] 예외: %s", e)
+            panel_ids = None
 
-        # CSS: spec_list > dl.spec_item:not(.spec_item_bg):not(.makerBrandArea) > dd.item_dd:not(.show_sub_item)
-        dd_selector = (
-            "div.spec_list dl.spec_item:not(.price_item) "
-            "> dd.item_dd:not(.show_sub_item)"
-        )
-        more_rel_selector = "button.btn_spec_view.btn_view_more"
-
-        while True:
-            closed_dds = option_box.find_elements(By.CSS_SELECTOR, dd_selector)
-            # '더보기' 버튼이 달린 dd 만 필터링
-            targets = [dd for dd in closed_dds if dd.find_elements(By.CSS_SELECTOR, more_rel_selector)]
-
-            if not targets:
-                break  # 더 이상 펼칠 패널 없음
-
-            for dd in targets:
+        # 3) 라벨 체크 - 1회 JS 호출로 일괄 처리, 오버레이 대기도 1회
+        labels = list(labels)
+        missing = labels  # 아직 찾지(체크하지) 못한 라벨 - 예외 시 이것만 개별 클릭
+        try:
+            missing = self._check_labels(labels)
+            if missing and cached_ids is not None:
+                # 캐시된 패널 id 가 낡음(DOM 변경) → 캐시 무효화 후 전체 펼치기로 이번 실행 안에 재시도
+                logger.debug("[옵션 캐시] '%s' 무효 -> 전체 패널 펼치기", cat_name)
+                _update_option_cache(cat_name, None)
+                cached_ids = None
                 try:
-                    more_btn = dd.find_element(By.CSS_SELECTOR, more_rel_selector)
-                    self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", more_btn)
-                    more_btn.click()
-                    # dd 에 show_sub_item 붙을 때까지
-                    self.wait.until(lambda d, _dd=dd: "show_sub_item" in _dd.get_attribute("class"))
-                    # 상품 리스트 오버레이 사라질 때까지
-                    self.wait.until(EC.invisibility_of_element_located((By.CSS_SELECTOR, ".product_list_cover")))
-                except (StaleElementReferenceException, ElementClickInterceptedException) as e:
-                    logger.debug("[옵션 더보기] 실패", e)
-                    continue
+                    panel_ids = self._expand_panels(None)
                 except Exception as e:
                     logger.debug("[옵션 더보기] 예외: %s", e)
-                    continue
+                    panel_ids = None
+                missing = self._check_labels(missing)
+            for label in missing:
+                logger.debug("[필터] '%s' 실패: 체크박스 없음", label)
+            if not missing and cached_ids is None and panel_ids:
+                _update_option_cache(cat_name, panel_ids)
+        except Exception as e:
+            logger.debug("[필터] 일괄 체크 실패 -> 미체크 라벨만 개별 클릭: %s", e)
+            self._click_checkboxes_one_by_one(missing)
 
-        # 3) 라벨 체크
+    def _check_labels(self, labels: list[str]) -> list[str]:
+        """라벨 체크박스 일괄 체크 (JS 1회 + 오버레이 대기 1회) → 찾지 못한 라벨 반환"""
+        found = set(self.driver.execute_script(_CHECK_LABELS_JS, labels))
+        # 체크는 이미 반영됨 → 오버레이 대기 실패는 로그만 (개별 클릭 경로로 넘기지 않음)
+        try:
+            self.wait.until(EC.invisibility_of_element_located((By.CSS_SELECTOR, ".product_list_cover")))
+        except TimeoutException:
+            logger.debug("[필터] 일괄 체크 후 오버레이 대기 시간 초과")
+        return [label for label in labels if label not in found]
+
+    @retry_on_stale()
+    def _expand_panels(self, panel_ids: list[str] | None = None) -> list[str]:
+        """
+        닫힌 패널의 '더보기' 일괄 클릭 → 모든 dd 에 show_sub_item 이 붙을 때까지 1회 대기
+        * 펼친 뒤 새 패널이 생길 수 있어 남은 버튼이 없을 때까지 반복
+        * panel_ids(캐시) 가 있으면 해당 dl 만 대상 → 전체 탐색 생략
+        * stale 발생 시 option_box 부터 다시 조회해 재시도
+        * TimeoutException 은 option_box 조회 실패일 때만 전파 (펼침 대기 초과는 로그만)
+        * 반환: 펼쳐진 패널(dl) id 목록
+        """
+        option_box = self.wait.until(
+            EC.presence_of_element_located(
+                (By.CSS_SELECTOR, "div#extendSearchOptionpriceCompare")
+            )
+        )
+        # CSS: spec_list > dl.spec_item:not(.spec_item_bg):not(.makerBrandArea) > dd.item_dd:not(.show_sub_item)
+        closed_more = "> dd.item_dd:not(.show_sub_item) button.btn_spec_view.btn_view_more"
+        if panel_ids:
+            more_selector = ", ".join(
+                f"dl.spec_item[id={json.dumps(pid, ensure_ascii=False)}] {closed_more}" for pid in panel_ids
+            )
+        else:
+            more_selector = f"div.spec_list dl.spec_item:not(.price_item) {closed_more}"
+        try:
+            while self.driver.execute_script(_EXPAND_MORE_JS, option_box, more_selector):
+                self.wait.until(
+                    lambda d: d.execute_script(_EXPAND_DONE_JS, option_box, more_selector)
+                )
+                self.wait.until(EC.invisibility_of_element_located((By.CSS_SELECTOR, ".product_list_cover")))
+        except TimeoutException:
+            # 펼침 대기 실패는 치명적이지 않음 → 펼쳐진 만큼으로 라벨 체크 진행
+            logger.debug("[옵션 더보기] 펼침 대기 시간 초과")
+        return self.driver.execute_script(_EXPANDED_IDS_JS, option_box)
+
+    def _click_checkboxes_one_by_one(self, labels: Iterable[str]) -> None:
+        """일괄 체크에서 처리하지 못한 라벨용 개별 클릭 경로"""
         for label in labels:
             try:
-                cb = self.wait.until(EC.presence_of_element_located((By.XPATH, f"//label[@title='{label}']/input[@type='checkbox']")))
-                self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", cb)
-                self.driver.execute_script("arguments[0].click();", cb)
-                self.wait.until(EC.invisibility_of_element_located((By.CSS_SELECTOR, ".product_list_cover")))
+                self._check_one(label)
                 # logger.debug("[필터] '%s' 체크", label)
             except Exception as e:
                 logger.debug("[필터] '%s' 실패: %s", label, e)
 
+    @retry_on_stale()
+    def _check_one(self, label: str) -> None:
+        cb = self.wait.until(EC.presence_of_element_located((By.XPATH, f"//label[@title='{label}']/input[@type='checkbox']")))
+        if cb.is_selected():  # 이미 체크됨 → 다시 클릭하면 필터가 꺼짐
+            return
+        self.driver.execute_script("arguments[0].scrollIntoView({block:'center'});", cb)
+        self.driver.execute_script("if (!arguments[0].checked) arguments[0].click();", cb)
+        self.wait.until(EC.invisibility_of_element_located((By.CSS_SELECTOR, ".product_list_cover")))
+
     # ------- 1 Page Item 90개 설정 ----------
     def _select_90_per_page(self) -> None:
         try:
@@ -238,8 +555,10 @@ class PriceCrawler:
             logger.debug("[페이지당 90개] 설정 실패: %s", e)
 
     # --------- 가격 수집 ----------------------
-    def _collect_prices(self, cat_name: str) -> list[PriceEntry]:
-        entries: list[PriceEntry] = []
+    def _collect_prices(self, cat_name: str) -> tuple[list[str], list[int | None]]:
+        # 행 객체 없이 (ID, 가격) 평행 리스트로 수집
+        pids: list[str] = []
+        prices: list[int | None] = []
         page = 1
         container_css = "div.main_prodlist.main_prodlist_list"
         list_css = f"{container_css} ul.product_list"
@@ -258,65 +577,98 @@ class PriceCrawler:
                     pid = li.get_attribute("id").split("_")[1]
                     try:
                         price_txt = li.find_element(By.CSS_SELECTOR, "p.price_sect strong").text.strip()
-                        price = int(price_txt.replace(",", "")) if price_txt else None
+                        price = int(price_txt.translate(_DIGITS_ONLY)) if price_txt else None
                     except (NoSuchElementException, ValueError):
                         price = None
-                    entries.append(PriceEntry(pid, price))
+                    pids.append(pid)
+                    prices.append(price)
                 except Exception:
                     continue
+            # 현재 페이지 번호 + 1
+            # page = int(self.driver.find_element(By.CSS_SELECTOR,".prod_num_nav .num_nav_wrap .num.now_on").text.strip())
+            page += 1
+            # 목록이 안정된 시점엔 페이지 네비도 렌더링 완료 → 조회+클릭을 JS 1회로
+            # (clickable 폴링/오버레이 클릭 가로채기 없음)
             try:
-                # 현재 페이지 번호 + 1
-                # page = int(self.driver.find_element(By.CSS_SELECTOR,".prod_num_nav .num_nav_wrap .num.now_on").text.strip())
-                page += 1
-                next_btn = self.wait.until(EC.element_to_be_clickable((
-                    By.XPATH,
-                    f"//a[contains(@onclick, 'movePage({page})')]"
-                )))
-                next_btn.click()
-
-            except (NoSuchElementException, TimeoutException) as e:
-                logger.debug("[%s] 마지막 페이지", cat_name)
-                break
-
+                moved = self.driver.execute_script(_MOVE_PAGE_JS, page)
             except Exception as e:
-                logger.debug("pagination 오류: ", e)
+                logger.debug("pagination 오류: %s", e)
+                break
+            if not moved:
+                logger.debug("[%s] 마지막 페이지", cat_name)
                 break
 
-        return entries
+        return pids, prices
 
     # -------- 행 안정 대기 ---------------------
-    def _wait_items_stable(self, list_css: str, timeout: int = 10, interval: float = 0.3):
-        end = time.time() + timeout
-        prev = -1
-        while time.time() < end:
-            cur = len(self.driver.find_elements(By.CSS_SELECTOR, f"{list_css} li[id^='productInfoDetail_']"))
-            if cur == prev and cur > 0:
-                return
-            prev = cur
-            time.sleep(interval)
-        raise TimeoutException("아이템 개수 안정 대기 시간 초과")
+    def _wait_items_stable(self, list_css: str, timeout: int = 10, quiet_ms: int = 300):
+        self.driver.set_script_timeout(timeout)
+        try:
+            count = self.driver.execute_async_script(
+                _WAIT_QUIET_JS, list_css, "li[id^='productInfoDetail_']", quiet_ms
+            )
+        except TimeoutException:
+            raise TimeoutException("아이템 개수 안정 대기 시간 초과") from None
+        if count <= 0:
+            raise TimeoutException("아이템 목록을 찾지 못함")
 
     # ------- csv 저장 -------------------
-    def _save_to_csv(self, csv_code: str, rows: List[PriceEntry]) -> None:
+    def _save_to_csv(self, csv_code: str, pids: List[str], prices: List[int | None]) -> None:
         raw_dir = BASE_DIR / "data" / "raw" / csv_code
         raw_dir.mkdir(parents=True, exist_ok=True)
         csv_path = raw_dir / f"{csv_code}_price.csv"
-        with csv_path.open("w", encoding="utf-8", newline="") as fp:
-            writer = csv.writer(fp)
-            writer.writerow(["ID", "Price"])
-            writer.writerows(entry.as_row() for entry in rows)
-
+        if not all(pid.isascii() and pid.isdigit() for pid in pids):
+            # 예상 밖 ID(따옴표/콤마 가능성) → 인용 처리가 되는 csv.writer 사용
+            with csv_path.open("w", encoding="utf-8", newline="") as fp:
+                writer = csv.writer(fp)
+                writer.writerow(["ID", "Price"])
+                writer.writerows(zip(pids, ("" if p is None else p for p in prices)))
+            return
+        # ID/가격 모두 ASCII 숫자 → 인용 불필요, bytearray 에 직접 포맷 후 큰 단위로 write
+        # (줄바꿈은 csv.writer 기본값과 같은 \r\n)
+        with csv_path.open("wb") as fp:
+            buf = bytearray(b"ID,Price\r\n")
+            for pid, price in zip(pids, prices):
+                buf += pid.encode("ascii")
+                buf += b","
+                if price is not None:
+                    buf += b"%d" % price
+                buf += b"\r\n"
+                if len(buf) >= CSV_FLUSH_BYTES:
+                    fp.write(buf)
+                    buf.clear()
+            fp.write(buf)
+
+
+# -------- 멀티 스레드 진입 -------------
+# Selenium 작업은 드라이버 소켓 대기(I/O) 위주 → 스레드 + 공유 BrowserPool
+POOL: BrowserPool | None = None
 
-# -------- 멀티 프로세스 진입 -------------
 def _worker(cat: Tuple[str, str]) -> None:
     name, code = cat
-    PriceCrawler().crawl(name, code)
+    driver = POOL.acquire()
+    try:
+        PriceCrawler(driver).crawl(name, code)
+    finally:
+        POOL.release(driver)
 
 def main(processes: int = max(cpu_count() // 2, 1)):
-    with Pool(processes) as pool:
-        pool.map(_worker, CATEGORIES)
+    """
+    카테고리별 가격 크롤링을 스레드 풀로 병렬 실행.
+    Chrome 은 BrowserPool 이 워커 수만큼만 띄우고 카테고리 간 재사용한다
+    (예: 9개 카테고리 / 워커 4개 → chromedriver 기동 9회 → 4회).
+    프로세스 풀 + 워커별 전역 드라이버로도 같은 효과를 낼 수 있지만,
+    작업이 드라이버 소켓 대기 위주라 pickling/IPC 비용만 늘어나므로 스레드를 유지한다.
+    """
+    global POOL
+    workers = min(processes, len(CATEGORIES))
+    POOL = BrowserPool(workers)
+    try:
+        with ThreadPoolExecutor(max_workers=workers) as ex:
+            list(ex.map(_worker, CATEGORIES))
+    finally:
+        POOL.close()
     logger.info(" 모든 카테고리 크롤링 완료")
 
 if __name__ == "__main__":
     main()
-
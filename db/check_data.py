@@ -1,7 +1,7 @@
 from pathlib import Path
-import json
+import orjson
+import re
 import numpy as np
-from statistics import mean, pstdev  # pstdev: 모집단 표준편차
 import sqlite3
 import matplotlib.pyplot as plt
 from math import erf, sqrt
@@ -9,36 +9,37 @@ from math import erf, sqrt
 BASE_DIR: Path = Path(__file__).resolve().parents[1]
 FILE_PATH: Path = BASE_DIR / "data" / "parsed" / "Cooler_parsed.json"
 
+# b"31.6dBA" → b"31.6" (bytes 패턴: ASCII 숫자만, 유니코드 분류 조회 없음)
+_NUM_RE = re.compile(rb"\d+(?:\.\d+)?")
 
-def check_cooler_noise():
-    average = 0
-    variance = 0
-    noise_values = []
-
-    with open(FILE_PATH, 'r', encoding='utf-8') as f:
-        data = json.load(f)
 
-    # 각 아이템의 max_noise 처리
+def _iter_noise(data):
+    """max_noise 는 단일값 또는 리스트 → 평탄화된 문자열 스트림으로 반환"""
     for item in data:
-        spec = item.get('spec', {})
-        max_noise = spec.get('max_noise')
+        mn = (item.get('spec') or {}).get('max_noise')
+        if not mn:
+            continue
+        if isinstance(mn, list):
+            yield from (v for v in mn if v)
+        else:
+            yield mn
 
-        # 리스트인지 단일값인지 확인
-        values = max_noise if isinstance(max_noise, list) else [max_noise]
 
-        for v in values:
-            if v is None:
-                continue
-            # 숫자 부분만 남기고 파싱 (예: "31.6dBA" → 31.6)
-            num = float(''.join(ch for ch in v if (ch.isdigit() or ch == '.')))
-            noise_values.append(num)
+def check_cooler_noise():
+    data = orjson.loads(FILE_PATH.read_bytes())
+
+    # 숫자 부분만 남기고 파싱 (예: "31.6dBA" → 31.6)
+    matches = (_NUM_RE.search(v.encode("ascii", "ignore")) for v in _iter_noise(data))
+    noise_values = np.fromiter(
+        (float(m.group()) for m in matches if m), dtype=np.float64
+    )
 
     print(noise_values)
     print(len(noise_values))
-    avg_noise = mean(noise_values)
-    std_noise = pstdev(noise_values)
-    max_noise = max(noise_values)
-    min_noise = min(noise_values)
+    avg_noise = float(noise_values.mean())
+    std_noise = float(noise_values.std())  # ddof=0: 모집단 표준편차
+    max_noise = float(noise_values.max())
+    min_noise = float(noise_values.min())
 
     print(f"noise 평균: {avg_noise:.2f} dBA")
     print(f"noise 표준편차: {std_noise:.2f} dBA")
@@ -7,6 +7,8 @@ def create_tables():
     cursor = conn.cursor()
     # 외래키 활성화
     cursor.execute("PRAGMA foreign_keys = ON;")
+    # WAL: 시딩(쓰기) 중에도 check_data / score_calculator 읽기가 막히지 않음 (DB 파일에 영구 저장)
+    cursor.execute("PRAGMA journal_mode = WAL;")
 
     # 1) users
     cursor.execute("""
@@ -111,6 +113,21 @@ def create_tables():
     );
     """)
 
+    # 9) 조회/조인 컬럼 인덱스
+    for stmt in [
+        "CREATE INDEX IF NOT EXISTS idx_components_cat ON components(category);",
+        "CREATE INDEX IF NOT EXISTS idx_components_web_cat ON components_web(category);",
+        "CREATE INDEX IF NOT EXISTS idx_estimates_uid ON estimates(user_id);",
+        "CREATE INDEX IF NOT EXISTS idx_estimate_items_eid ON estimate_items(estimate_id);",
+        "CREATE INDEX IF NOT EXISTS idx_estimate_items_pid ON estimate_items(product_id);",
+        "CREATE INDEX IF NOT EXISTS idx_estimate_items_wid ON estimate_items(product_web_id);",
+        "CREATE INDEX IF NOT EXISTS idx_messages_sid ON messages(session_id);",
+        "CREATE INDEX IF NOT EXISTS idx_sessions_uid ON sessions(user_id);",
+    ]:
+        cursor.execute(stmt)
+    # 플래너 통계 갱신
+    cursor.execute("ANALYZE;")
+
     conn.commit()
     conn.close()
 
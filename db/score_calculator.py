@@ -3,12 +3,16 @@ CPU/VGA 파이널 JSON을 순회하여
 1) 각 벤치마크 최고점(max_xxx)
 2) CPU·GPU 최대 가성비(max_cpu_value, max_gpu_value)
 을 계산해 출력/DB에 저장한다.
+
+실행: python -m db.score_calculator  (import 시에는 아무 작업도 하지 않음, main() 호출)
 """
 
-import json
 import sqlite3
 from pathlib import Path
-from typing import Dict, List
+from typing import Dict, List, Tuple
+
+import numpy as np
+import orjson
 
 # ────────────────────── 경로 ──────────────────────
 ROOT = Path(__file__).resolve().parents[1]
@@ -30,91 +34,89 @@ GPU_METRICS = ["3d_mark",
 
 # ─────────────────── 유틸 ─────────────────────────
 def _load_json(path: Path) -> List[Dict]:
-    with open(path, encoding="utf-8") as f:
-        return json.load(f)
-
-def _max_by_metric(products: List[Dict], metrics: List[str]) -> Dict[str, int]:
-    """리스트에서 각 metric 의 최댓값 반환"""
-    maxima = {m: 0 for m in metrics}
-    for p in products:
-        spec = p.get("spec", {})
-        for m in metrics:
-            maxima[m] = max(maxima[m], int(float(spec.get(m, 0) or 0)))
-    return maxima
-
-# ─────────────────── 1) 최고점 계산 ─────────────────
-cpu_products = _load_json(CPU_JSON)
-gpu_products = _load_json(GPU_JSON)
-
-cpu_max = _max_by_metric(cpu_products, CPU_METRICS)
-gpu_max = _max_by_metric(gpu_products, GPU_METRICS)
-
-# ───────────── 2) 공통 스코어 계산기 ───────────────
-def _calc_score(spec: Dict[str, float],
-                metrics: List[str],
-                max_map: Dict[str, int]) -> float:
-    """선택 지표만 사용해 0~100 점 환산"""
-    total, used = 0.0, 0
-    for m in metrics:
-        vmax = max_map.get(m, 0)
-        vcur = float(spec.get(m, 0) or 0)
-        if vmax > 0 and vcur > 0:
-            total += vcur / vmax
-            used  += 1
-    if used == 0:
-        return 0.0
-    return total / used * 100      # 100점 만점
-
-# 래퍼 함수
-cpu_score = lambda spec: _calc_score(spec, CPU_METRICS, cpu_max)
-gpu_score = lambda spec: _calc_score(spec, GPU_METRICS, gpu_max)
-
-max_cpu_value = 0.0
-for p in cpu_products:
-    price = p.get("price") or 0
-    if price > 0:
-        value = cpu_score(p.get("spec", {})) / price
-        max_cpu_value = max(max_cpu_value, value)
-
-max_gpu_value = 0.0
-for p in gpu_products:
-    price = p.get("price") or 0
-    if price > 0:
-        value = gpu_score(p.get("spec", {})) / price
-        max_gpu_value = max(max_gpu_value, value)
-
-# ─────────────── 3) DB 저장 (옵션) ────────────────
-
-conn = sqlite3.connect(DB_PATH)
-cur  = conn.cursor()
-
-def upsert(name: str, category: str, value: float):
-    cur.execute("""
-        INSERT INTO score_statistics(name, category, value)
-        VALUES (?, ?, ?)
-        ON CONFLICT(name) DO UPDATE SET
-            category   = excluded.category,   -- ← 함께 갱신
-            value      = excluded.value,
-            updated_at = CURRENT_TIMESTAMP
-    """, (name, category, value))
-
-# 벤치 최고점
-for k, v in cpu_max.items():
-    upsert(k, "CPU", v)
-for k, v in gpu_max.items():
-    upsert(k, "GPU", v)
-
-# 가성비 최고점
-upsert("max_cpu_value", "CPU", max_cpu_value)
-upsert("max_gpu_value", "GPU", max_gpu_value)
-
-conn.commit()
-conn.close()
-
-print("=== Max Benchmarks ===")
-print(cpu_max)
-print(gpu_max)
-print(f"max_cpu_value : {max_cpu_value:.8f}")
-print(f"max_gpu_value : {max_gpu_value:.8f}")
-
-
+    return orjson.loads(path.read_bytes())
+
+def _to_matrix(products: List[Dict], metrics: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    """제품 리스트 → (제품 × metric) 점수 행렬, 가격 벡터 (결측/0 은 0.0)"""
+    arr = np.array(
+        [[float(p.get("spec", {}).get(m, 0) or 0) for m in metrics]
+         for p in products],
+        dtype=np.float64,
+    ).reshape(len(products), len(metrics))
+    prices = np.array([float(p.get("price") or 0) for p in products], dtype=np.float64)
+    return arr, prices
+
+def _max_by_metric(arr: np.ndarray, metrics: List[str]) -> Dict[str, int]:
+    """행렬에서 각 metric 의 최댓값 반환 (열 단위 max 한 번)"""
+    if arr.shape[0] == 0:
+        return {m: 0 for m in metrics}
+    col_max = np.maximum(arr.max(axis=0), 0).astype(np.int64)
+    return {m: int(v) for m, v in zip(metrics, col_max)}
+
+# ───────────── 공통 스코어 계산기 ───────────────
+def _calc_scores(arr: np.ndarray, maxima: np.ndarray) -> np.ndarray:
+    """제품별 0~100 점 환산 - 최고점·현재값이 모두 양수인 지표만 평균"""
+    used = (arr > 0) & (maxima > 0)
+    ratio = np.divide(arr, maxima, out=np.zeros_like(arr), where=used)
+    n_used = used.sum(axis=1)
+    return np.divide(ratio.sum(axis=1), n_used,
+                     out=np.zeros(arr.shape[0]), where=n_used > 0) * 100  # 100점 만점
+
+def _max_value(arr: np.ndarray, prices: np.ndarray, max_map: Dict[str, int]) -> float:
+    """가격 > 0 인 제품 중 최대 가성비(점수/가격)"""
+    maxima = np.fromiter(max_map.values(), dtype=np.float64, count=len(max_map))
+    scores = _calc_scores(arr, maxima)
+    values = np.divide(scores, prices, out=np.zeros_like(scores), where=prices > 0)
+    return float(values.max(initial=0.0))
+
+# ─────────────────── 진입점 ─────────────────────────
+def main(db_path: Path = DB_PATH) -> Dict[str, object]:
+    """
+    1) 최고점·가성비 계산 → 2) score_statistics 저장 → 결과 dict 반환
+    (import 만으로는 파일 I/O·DB 쓰기가 일어나지 않도록 함수로 분리)
+    """
+    # ─────────────── 1) 최고점 / 가성비 계산 ───────────────
+    cpu_arr, cpu_prices = _to_matrix(_load_json(CPU_JSON), CPU_METRICS)
+    gpu_arr, gpu_prices = _to_matrix(_load_json(GPU_JSON), GPU_METRICS)
+
+    cpu_max = _max_by_metric(cpu_arr, CPU_METRICS)
+    gpu_max = _max_by_metric(gpu_arr, GPU_METRICS)
+
+    max_cpu_value = _max_value(cpu_arr, cpu_prices, cpu_max)
+    max_gpu_value = _max_value(gpu_arr, gpu_prices, gpu_max)
+
+    # ─────────────── 2) DB 저장 ───────────────
+    # 벤치 최고점 + 가성비 최고점 → executemany 1회
+    stats = [(k, "CPU", v) for k, v in cpu_max.items()]
+    stats += [(k, "GPU", v) for k, v in gpu_max.items()]
+    stats += [("max_cpu_value", "CPU", max_cpu_value),
+              ("max_gpu_value", "GPU", max_gpu_value)]
+
+    conn = sqlite3.connect(db_path)
+    try:
+        conn.executemany("""
+            INSERT INTO score_statistics(name, category, value)
+            VALUES (?, ?, ?)
+            ON CONFLICT(name) DO UPDATE SET
+                category   = excluded.category,   -- ← 함께 갱신
+                value      = excluded.value,
+                updated_at = CURRENT_TIMESTAMP
+        """, stats)
+        conn.commit()
+    finally:
+        conn.close()
+
+    return {
+        "cpu_max": cpu_max,
+        "gpu_max": gpu_max,
+        "max_cpu_value": max_cpu_value,
+        "max_gpu_value": max_gpu_value,
+    }
+
+if __name__ == "__main__":
+    result = main()
+    print("=== Max Benchmarks ===")
+    print(result["cpu_max"])
+    print(result["gpu_max"])
+    print(f"max_cpu_value : {result['max_cpu_value']:.8f}")
+    print(f"max_gpu_value : {result['max_gpu_value']:.8f}")
@@ -1,8 +1,9 @@
 #!/usr/bin/env python3
 import sqlite3
-import json
 import os
 
+import orjson
+
 DB_PATH = "../askspec.db"
 
 # 스크립트 위치 기준으로 data/parsed 디렉터리를 가리키도록 설정
@@ -18,38 +19,44 @@ def seed_components():
     conn = sqlite3.connect(DB_PATH)
     cursor = conn.cursor()
     cursor.execute("PRAGMA foreign_keys = ON;")
+    # 시딩은 일괄 쓰기 → WAL + fsync 완화로 디스크 동기화 최소화
+    cursor.execute("PRAGMA journal_mode = WAL;")
+    cursor.execute("PRAGMA synchronous = NORMAL;")
+    cursor.execute("PRAGMA temp_store = MEMORY;")
 
-    for filename in os.listdir(FINAL_DIR):
-        if not filename.endswith("_final.json"):
-            continue
+    with conn:  # 전체 파일을 하나의 트랜잭션으로 (실패 시 롤백)
+        for filename in os.listdir(FINAL_DIR):
+            if not filename.endswith("_final.json"):
+                continue
 
-        # 예: "CPU_parsed.json" → category="cpu"
-        category = filename.split("_", 1)[0].lower()
-        file_path = os.path.join(FINAL_DIR, filename)
-        print(file_path)
-        with open(file_path, encoding="utf-8") as f:
-            products = json.load(f)
+            # 예: "CPU_parsed.json" → category="cpu"
+            category = filename.split("_", 1)[0].lower()
+            file_path = os.path.join(FINAL_DIR, filename)
+            print(file_path)
+            with open(file_path, "rb") as f:
+                products = orjson.loads(f.read())
 
-        for prod in products:
-            cursor.execute("""
+            rows = [
+                (
+                    prod["id"],
+                    category,
+                    prod["name"],
+                    orjson.dumps(prod.get("spec", {}), option=orjson.OPT_NON_STR_KEYS).decode(),
+                    prod.get("price"),
+                    1 if prod.get("in_stock") else 0,
+                    prod.get("image_url"),
+                    prod.get("product_url"),
+                )
+                for prod in products
+            ]
+            cursor.executemany("""
                 INSERT OR REPLACE INTO components
                   (product_id, category, name,
                    spec, price, in_stock,
                    image_url, product_url)
                 VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (
-                prod["id"],
-                category,
-                prod["name"],
-                json.dumps(prod.get("spec", {}), ensure_ascii=False),
-                prod.get("price"),
-                1 if prod.get("in_stock") else 0,
-                prod.get("image_url"),
-                prod.get("product_url")
-            ))
-
-
-    conn.commit()
+            """, rows)
+
     conn.close()
     print("Components 테이블에 시딩을 완료했습니다.")
 
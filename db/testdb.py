@@ -1,5 +1,9 @@
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
 from dotenv import load_dotenv
+import functools
 import os
+import threading
 from pinecone import Pinecone
 from openai import OpenAI
 # ------------- 환경 변수 ----------------
@@ -8,6 +12,10 @@ PINECONE_API_KEY = os.getenv("PINECONE_API_KEY")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 INDEX_NAME = "pc-components"
 DIMENSION  = 1536
+EMBED_MODEL = "text-embedding-3-small"
+EMBED_BATCH = 2048   # embeddings API 요청당 최대 입력 수
+QUERY_WORKERS = 8    # Pinecone 병렬 질의 스레드 수
+QUERY_CACHE_SIZE = 4096  # 쿼리 임베딩 캐시 최대 항목 수
 
 # ---------- 1) 클라이언트 초기화 ------------
 openai_client = OpenAI(api_key=OPENAI_API_KEY)
@@ -16,26 +24,68 @@ pinecone = Pinecone(api_key = PINECONE_API_KEY)
 index = pinecone.Index(INDEX_NAME)
 
 # 3) 쿼리 텍스트를 임베딩하는 함수
+def embed_queries(texts: list[str]) -> list[list[float]]:
+    """여러 쿼리를 EMBED_BATCH 개씩 묶어 요청 (N회 → ceil(N/EMBED_BATCH)회)"""
+    vectors: list[list[float]] = []
+    for i in range(0, len(texts), EMBED_BATCH):
+        resp = openai_client.embeddings.create(
+            model=EMBED_MODEL,
+            input=texts[i:i + EMBED_BATCH],
+        )
+        vectors.extend(d.embedding for d in resp.data)
+    return vectors
+
+# 정규화(공백 정리)된 쿼리 → 벡터 LRU 캐시 (단건/다건 경로 공용)
+_QUERY_CACHE: OrderedDict[str, tuple[float, ...]] = OrderedDict()
+_QUERY_CACHE_LOCK = threading.Lock()
+
+def _normalize(text: str) -> str:
+    return " ".join(text.split())
+
+def embed_many(texts: list[str]) -> list[list[float]]:
+    """캐시 hit 은 그대로, miss 만 모아 embed_queries 배치 요청 (동일 쿼리는 1회만)"""
+    keys = [_normalize(t) for t in texts]
+    found: dict[str, tuple[float, ...]] = {}
+    with _QUERY_CACHE_LOCK:
+        for k in keys:
+            if k in _QUERY_CACHE:
+                _QUERY_CACHE.move_to_end(k)
+                found[k] = _QUERY_CACHE[k]
+    miss = list(dict.fromkeys(k for k in keys if k not in found))
+    if miss:
+        fresh = dict(zip(miss, map(tuple, embed_queries(miss))))
+        with _QUERY_CACHE_LOCK:
+            _QUERY_CACHE.update(fresh)
+            while len(_QUERY_CACHE) > QUERY_CACHE_SIZE:
+                _QUERY_CACHE.popitem(last=False)
+        found.update(fresh)
+    return [list(found[k]) for k in keys]
+
 def embed_query(text: str) -> list[float]:
-    resp = openai_client.embeddings.create(
-        model="text-embedding-3-small",
-        input=text,
-    )
-    # 첫 번째 결과의 embedding 벡터 반환
-    # return resp["data"][0]["embedding"]
-    return [d.embedding for d in resp.data]
+    # 동일 쿼리(공백 차이 포함)는 캐시에서 반환
+    return embed_many([text])[0]
 
 # 4) Pinecone에서 유사도 검색 수행
-def search_pinecone(query: str, top_k: int = 10):
-    # 4.1) 쿼리를 임베딩
-    vector = embed_query(query)
-    # 4.2) 인덱스에 질의
-    result = index.query(
+def _query(vector: list[float], top_k: int):
+    return index.query(
         vector=vector,
         top_k=top_k,
         include_metadata=True  # 메타데이터(예: name, specs) 함께 가져오기
     )
-    return result
+
+def search_pinecone(query: str, top_k: int = 10):
+    # 4.1) 쿼리를 임베딩 (캐시 경유)
+    vector = embed_query(query)
+    # 4.2) 인덱스에 질의
+    return _query(vector, top_k)
+
+def search_pinecone_many(queries: list[str], top_k: int = 10) -> list:
+    """여러 쿼리를 배치 1회로 임베딩(캐시 경유) 후 Pinecone 질의는 스레드로 병렬 처리"""
+    if isinstance(queries, str):
+        raise TypeError("search_pinecone_many 는 쿼리 리스트를 받음 - 단건은 search_pinecone 사용")
+    vectors = embed_many(queries)
+    with ThreadPoolExecutor(max_workers=min(QUERY_WORKERS, len(vectors)) or 1) as ex:
+        return list(ex.map(functools.partial(_query, top_k=top_k), vectors))
 
 # 5) 결과 출력
 if __name__ == "__main__":
@@ -1,15 +1,37 @@
 from dotenv import load_dotenv
+import asyncio
+import hashlib
 import os, glob, json
-from typing import Dict, List
+import sqlite3
+from functools import lru_cache
+from typing import Dict, Iterable, List, Tuple
 from pathlib import Path
+import numpy as np
 from pinecone import Pinecone, ServerlessSpec
-from openai import OpenAI
+from openai import AsyncOpenAI
+import tiktoken
+
+__all__ = [
+    "get_openai", "get_index",
+    "compatibility_spec", "performance_spec", "spec_to_text", "build_meta",
+    "EmbeddingCache", "embed_texts", "pack_batches", "embed_batches", "embed_and_upsert",
+]
+
 # ------------- 환경 변수 ----------------
 load_dotenv()
 PINECONE_API_KEY = os.getenv("PINECONE_API_KEY")
 OPENAI_API_KEY = os.getenv("OPENAI_API_KEY")
 INDEX_NAME = "pc-components"
 DIMENSION  = 1536
+EMBED_MODEL = "text-embedding-3-small"
+EMBED_CONCURRENCY = 6   # 동시 embeddings 요청 수 (rate limit 고려)
+EMBED_MAX_RETRIES = 5   # SDK 가 429/5xx 를 Retry-After 에 맞춰 재시도
+EMBED_INPUT_TOKENS = 8191      # 입력 1개당 최대 토큰 (모델 한도) - 초과분은 잘라서 요청
+EMBED_BATCH_TOKENS = 300_000   # 요청 1회당 전체 토큰 한도 (API 한도)
+EMBED_BATCH_ITEMS = 2048       # 요청 1회당 최대 입력 수 (API 한도)
+UPSERT_BATCH = 100         # Pinecone upsert 1회당 벡터 수 (요청 크기 2MB 한도)
+# 재실행 시 변경 없는 텍스트는 API 호출 없이 재사용 (sha256(model|text) → 벡터)
+EMBED_CACHE_PATH = Path(__file__).resolve().parents[1] / "data" / "cache" / "embeddings.sqlite"
 COMPATIBILITY_SPEC: dict[str, list[str]] = {
     "CPU": ["memory_type", "tdp", "ppt", "pbp-mtp", "pcie_versions","socket"],
     "Cooler": ["intel_sockets", "amd_sockets", "width", "depth", "height", "connector", "radiator_rows", "radiator_width", "radiator_thickness", "tdp", "tower_design"],
@@ -30,66 +52,198 @@ PERFORMANCE_SPEC: dict[str, list[str]] = {
     "Case": [],
     "PSU": ["eta_certification", "lambda_certification", "efficiency"],
 }
+# 키 멤버십 검사를 O(1) 로 - 모듈 로드 시 1회 변환
+COMPATIBILITY_SPEC_SETS: dict[str, frozenset[str]] = {k: frozenset(v) for k, v in COMPATIBILITY_SPEC.items()}
+PERFORMANCE_SPEC_SETS: dict[str, frozenset[str]] = {k: frozenset(v) for k, v in PERFORMANCE_SPEC.items()}
 
-# ---------- 1) 클라이언트 초기화 ------------
-openai_client = OpenAI(api_key=OPENAI_API_KEY)
-pc = Pinecone(api_key = PINECONE_API_KEY)
-
-if not pc.has_index(INDEX_NAME):
-    pc.create_index(
-        name=INDEX_NAME,
-        dimension=DIMENSION,
-        metric="cosine",
-        spec=ServerlessSpec(
-            cloud='aws',
-            region='us-east-1'
-        )
-    )
-else:
-    print(f"[Info] Index '{INDEX_NAME}' already exists, skip creation.")
+# ---------- 1) 클라이언트 (지연 초기화) ------------
+# import 만 하는 스크립트(build_meta, spec_to_text 등)는 네트워크 접속 없이 사용 가능
+@lru_cache(maxsize=1)
+def get_openai() -> AsyncOpenAI:
+    return AsyncOpenAI(api_key=OPENAI_API_KEY, max_retries=EMBED_MAX_RETRIES)
 
-index = pc.Index(INDEX_NAME)
+@lru_cache(maxsize=1)
+def get_index():
+    """Pinecone 인덱스 핸들 - 없으면 생성 (최초 호출 시 1회)"""
+    pc = Pinecone(api_key=PINECONE_API_KEY)
+    if not pc.has_index(INDEX_NAME):
+        pc.create_index(
+            name=INDEX_NAME,
+            dimension=DIMENSION,
+            metric="cosine",
+            spec=ServerlessSpec(
+                cloud='aws',
+                region='us-east-1'
+            )
+        )
+    else:
+        print(f"[Info] Index '{INDEX_NAME}' already exists, skip creation.")
+    return pc.Index(INDEX_NAME)
 
 # ------------ 유틸 함수 ----------------
-def compatibility_spec(spec: Dict[str, str], category) -> str:
+def _spec_to_text(spec: Dict[str, str], allowed: frozenset[str] | None = None) -> str:
+    """dict → 'key: value; ...' 텍스트 (allowed 가 있으면 해당 키만)"""
     parts = []
     for k, v in spec.items():
-        if k not in COMPATIBILITY_SPEC.get(category):
+        if allowed is not None and k not in allowed:
             continue
         if isinstance(v, list):
             v = ", ".join(map(str, v))
         parts.append(f"{k}: {v}")
     return "; ".join(parts)
 
+def compatibility_spec(spec: Dict[str, str], category) -> str:
+    return _spec_to_text(spec, COMPATIBILITY_SPEC_SETS.get(category, frozenset()))
+
 def performance_spec(spec: Dict[str, str], category) -> str:
-    parts = []
-    for k, v in spec.items():
-        if k not in PERFORMANCE_SPEC.get(category):
-            continue
-        if isinstance(v, list):
-            v = ", ".join(map(str, v))
-        parts.append(f"{k}: {v}")
-    return "; ".join(parts)
+    return _spec_to_text(spec, PERFORMANCE_SPEC_SETS.get(category, frozenset()))
 
 def spec_to_text(spec: Dict[str, str]) -> str:
     """dict → 'key value' 로 이어붙여 임베딩용 텍스트 생성"""
-    parts = []
+    return _spec_to_text(spec)
+
+def _split_spec(spec: Dict[str, str], category: str) -> Tuple[str, str, str]:
+    """spec 1회 순회로 (전체 text, performance_spec, compatibility_spec) 생성"""
+    perf_allow = PERFORMANCE_SPEC_SETS.get(category, frozenset())
+    compat_allow = COMPATIBILITY_SPEC_SETS.get(category, frozenset())
+    all_p, perf_p, compat_p = [], [], []
     for k, v in spec.items():
         if isinstance(v, list):
             v = ", ".join(map(str, v))
-        parts.append(f"{k}: {v}")
-    return "; ".join(parts)
+        s = f"{k}: {v}"
+        all_p.append(s)
+        if k in perf_allow:
+            perf_p.append(s)
+        if k in compat_allow:
+            compat_p.append(s)
+    return "; ".join(all_p), "; ".join(perf_p), "; ".join(compat_p)
+
+class EmbeddingCache:
+    """
+    임베딩 디스크 캐시 - SQLite 에 float16 bytes 로 보관 (float32 대비 1/2 크기)
+    - 코사인 유사도 오차는 무시할 수준, Pinecone 에는 float32 로 복원해 전달
+    """
+
+    _CHUNK = 500  # IN (...) 바인딩 변수 개수 제한 대응
+    _DTYPE = np.float16
+
+    def __init__(self, path: Path = EMBED_CACHE_PATH):
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self._conn = sqlite3.connect(path)
+        self._conn.execute("PRAGMA journal_mode = WAL;")
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS embeddings_f16 (key TEXT PRIMARY KEY, vec BLOB NOT NULL);"
+        )
+
+    @staticmethod
+    def key(text: str) -> str:
+        return hashlib.sha256(f"{EMBED_MODEL}|{text}".encode("utf-8")).hexdigest()
+
+    def get_many(self, keys: List[str]) -> Dict[str, List[float]]:
+        found: Dict[str, List[float]] = {}
+        for i in range(0, len(keys), self._CHUNK):
+            chunk = keys[i : i + self._CHUNK]
+            rows = self._conn.execute(
+                f"SELECT key, vec FROM embeddings_f16 WHERE key IN ({','.join('?' * len(chunk))})",
+                chunk,
+            )
+            found.update(
+                (k, np.frombuffer(v, dtype=self._DTYPE).astype(np.float32).tolist()) for k, v in rows
+            )
+        return found
+
+    def put_many(self, items: Iterable[Tuple[str, List[float]]]) -> None:
+        with self._conn:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO embeddings_f16(key, vec) VALUES (?, ?);",
+                ((k, np.asarray(v, dtype=self._DTYPE).tobytes()) for k, v in items),
+            )
+
+    def close(self) -> None:
+        self._conn.close()
 
-def embed_texts(texts: List[str]) -> List[List[float]]:
-    """배치 임베딩(OpenAI)"""
-    resp = openai_client.embeddings.create(
-        model="text-embedding-3-small",
-        input=texts,
-    )
+async def _request_embeddings(texts: List[str], sem: asyncio.Semaphore) -> List[List[float]]:
+    """배치 임베딩(OpenAI) - sem 으로 동시 요청 수 제한"""
+    async with sem:
+        resp = await get_openai().embeddings.create(
+            model=EMBED_MODEL,
+            input=texts,
+        )
     return [d.embedding for d in resp.data]
 
+async def embed_texts(texts: List[str], sem: asyncio.Semaphore,
+                      cache: EmbeddingCache | None = None) -> List[List[float]]:
+    """캐시 hit 은 그대로 사용하고 miss 만 API 로 요청, 결과는 캐시에 기록"""
+    if cache is None:
+        return await _request_embeddings(texts, sem)
+    keys = [cache.key(t) for t in texts]
+    found = cache.get_many(keys)
+    miss = [i for i, k in enumerate(keys) if k not in found]
+    if miss:
+        fresh = list(zip((keys[i] for i in miss),
+                         await _request_embeddings([texts[i] for i in miss], sem)))
+        cache.put_many(fresh)
+        found.update(fresh)
+    return [found[k] for k in keys]
+
+def pack_batches(records: List[tuple], token_counts: List[int],
+                 max_tokens: int = EMBED_BATCH_TOKENS,
+                 max_items: int = EMBED_BATCH_ITEMS) -> List[List[tuple]]:
+    """
+    토큰 수 기준 greedy 배치 구성 - 요청 1회당 API 한도(입력 수·총 토큰)까지 채운다
+    (입력 1개가 EMBED_INPUT_TOKENS 를 넘으면 ValueError - 호출 전에 잘라 둘 것)
+    """
+    batches, cur, cur_tokens = [], [], 0
+    for rec, n in zip(records, token_counts):
+        if n > EMBED_INPUT_TOKENS:
+            raise ValueError(f"입력 토큰 {n}개 > 모델 한도 {EMBED_INPUT_TOKENS}: {rec[0]!r}")
+        if cur and (cur_tokens + n > max_tokens or len(cur) == max_items):
+            batches.append(cur)
+            cur, cur_tokens = [], 0
+        cur.append(rec)
+        cur_tokens += n
+    if cur:
+        batches.append(cur)
+    return batches
+
+async def embed_batches(batches: List[List[str]],
+                        concurrency: int = EMBED_CONCURRENCY,
+                        cache: EmbeddingCache | None = None) -> List[List[List[float]]]:
+    """여러 배치를 동시에 임베딩 (네트워크 대기 중첩), 입력 순서대로 반환"""
+    sem = asyncio.Semaphore(concurrency)
+    return await asyncio.gather(*(embed_texts(b, sem, cache) for b in batches))
+
+def _upsert(batch: List[tuple], vectors: List[List[float]]) -> None:
+    """(id, text, meta) 배치 + 벡터 → Pinecone upsert (UPSERT_BATCH 단위로 분할)"""
+    ids, _, metas = zip(*batch)
+    items = list(zip(ids, vectors, metas))
+    index = get_index()
+    for i in range(0, len(items), UPSERT_BATCH):
+        index.upsert(vectors=items[i : i + UPSERT_BATCH])
+
+async def embed_and_upsert(batches: List[List[tuple]],
+                           concurrency: int = EMBED_CONCURRENCY,
+                           cache: EmbeddingCache | None = None) -> None:
+    """
+    배치별 임베딩 → upsert 파이프라인
+    - 임베딩이 끝난 배치는 바로 스레드에서 upsert, 그동안 다른 배치는 임베딩 계속
+    - 전체 임베딩 완료를 기다렸다가 순차 upsert 하던 것 대비 네트워크 대기 중첩
+    """
+    sem = asyncio.Semaphore(concurrency)
+    total, done = sum(map(len, batches)), 0
+
+    async def run(batch: List[tuple]) -> None:
+        nonlocal done
+        vectors = await embed_texts([text for _, text, _ in batch], sem, cache)
+        await asyncio.to_thread(_upsert, batch, vectors)
+        done += len(batch)
+        print(f"[{done:>5}/{total}] upsert 완료")
+
+    await asyncio.gather(*(run(b) for b in batches))
+
 def build_meta(item: Dict, category: str) -> Dict:
     """가격·재고가 비어 있으면 필드 자체를 생략한다."""
+    text, perf, compat = _split_spec(item['spec'], category)
     meta = {
         "product_id": item["id"],
         "name": item["name"],
@@ -98,9 +252,9 @@ def build_meta(item: Dict, category: str) -> Dict:
         "category": category,
         "price": item["price"],
         "in_stock": item["in_stock"],
-        "performance_spec": performance_spec(item['spec'], category),
-        "compatibility_spec": compatibility_spec(item['spec'], category),
-        "text": spec_to_text(item['spec'])
+        "performance_spec": perf,
+        "compatibility_spec": compat,
+        "text": text
     }
     return meta
 
@@ -119,15 +273,25 @@ if __name__ == "__main__":
                 if item.get('price') is None:
                     item['price'] = "가격 정보 없음"
                 vector_id = str(item['id'])      # 유니크 ID
-                text      = f"{item['name']}; price {item['price']}; {spec_to_text(item['spec'])}"
                 metadata = build_meta(item, category)
+                text      = f"{item['name']}; price {item['price']}; {metadata['text']}"
                 records.append((vector_id, text, metadata))
 
     # ------------------ 배치 임베딩 & 업서트 ----------------
-    BATCH = 100
-    for i in range(0, len(records), BATCH):
-        batch = records[i : i + BATCH]
-        ids, texts, metas = zip(*batch)
-        vectors = embed_texts(list(texts))
-        index.upsert(vectors=list(zip(ids, vectors, metas)))
-        print(f"[{i+len(batch):>5}/{len(records)}] upsert 완료")
+    # 토큰 수는 레코드 구성 후 한 번만 계산 (text-embedding-3-* = cl100k_base)
+    enc = tiktoken.get_encoding("cl100k_base")
+    token_counts = []
+    for i, toks in enumerate(enc.encode_ordinary_batch([text for _, text, _ in records])):
+        if len(toks) > EMBED_INPUT_TOKENS:  # 모델 입력 한도 초과 → 앞부분만 임베딩
+            vector_id, _, metadata = records[i]
+            records[i] = (vector_id, enc.decode(toks[:EMBED_INPUT_TOKENS]), metadata)
+            toks = toks[:EMBED_INPUT_TOKENS]
+        token_counts.append(len(toks))
+    batches = pack_batches(records, token_counts)
+    get_index()  # upsert 스레드들이 동시에 생성 확인하지 않도록 미리 1회 초기화
+    cache = EmbeddingCache()
+    try:
+        asyncio.run(embed_and_upsert(batches, cache=cache))
+    finally:
+        cache.close()
+    print(f"[{len(records)}] 임베딩·업서트 완료 ({len(batches)} 배치)")
@@ -0,0 +1,107 @@
+"""_parse_core.py
+
+Per-row spec parsing hot path used by `GenericParser` (parser.py).
+
+Pure, fully typed functions only – so the module can be compiled with
+mypyc for extra speed::
+
+    cd parsers && mypyc _parse_core.py
+
+The built extension (`_parse_core.*.so`) takes import precedence over this
+file; without it the same source runs as plain Python.
+"""
+from __future__ import annotations
+
+import re
+from typing import Any, Dict, List, Tuple
+
+# 스펙 문자열 전처리 치환표 - 단일 정규식으로 1회 스캔
+_REPL: Dict[str, str] = {
+    "A/S": "AS",
+    "S/W": "SW",
+    "Gb/s": "Gbs",
+    "MB/s": "Mbs",
+    "싱글/다중": "싱글,다중",
+}
+_REPL_RE = re.compile("|".join(map(re.escape, _REPL)))
+_BRACKET_RE = re.compile(r"\[[^]]*]")
+
+
+def _repl(m: re.Match[str]) -> str:
+    return _REPL[m.group()]
+
+
+def parse_spec(spec: str, rules: Dict[str, Any]) -> Dict[str, Any]:
+    colon_segs, plain_segs = split_segments(preprocess(spec))
+    return apply_rules(colon_segs, plain_segs, rules)
+
+
+def preprocess(txt: str) -> str:
+    txt = _REPL_RE.sub(_repl, txt)
+    if "유휴/탐색" in txt and "소음(" in txt:
+        s, e = txt.find("소음("), txt.rfind("dB") + 2
+        txt = txt[:s] + txt[s:e].replace("/", ",") + txt[e:]
+    if "순차읽기" in txt:
+        for tag in ("순차읽기:", "순차쓰기:", "읽기IOPS:", "쓰기IOPS:"):
+            txt = txt.replace(tag, tag[:-1])
+    return txt
+
+
+def split_segments(spec: str) -> Tuple[List[str], List[str]]:
+    """'/' 구분 세그먼트를 1회 순회로 (colon‑style, pattern‑style) 로 분류"""
+    colon_segs: List[str] = []
+    plain_segs: List[str] = []
+    for seg in " ".join(_BRACKET_RE.split(spec)).split("/"):
+        s = seg.strip()
+        if not s:
+            continue
+        (colon_segs if ":" in s else plain_segs).append(s)
+    return colon_segs, plain_segs
+
+
+def apply_rules(colon_segs: List[str], plain_segs: List[str],
+                rules: Dict[str, Any]) -> Dict[str, Any]:
+    res: Dict[str, Any] = {}
+    colon_cfg: Dict[str, str] = rules.get("colon_keys", {})
+    # colon‑style
+    for seg in colon_segs:
+        k_raw, _, v_raw = seg.partition(":")
+        ek = colon_cfg.get(k_raw.strip())
+        if ek is not None:
+            v_raw = v_raw.strip()
+            res[ek] = [v.strip() for v in v_raw.split(",")] if "," in v_raw else v_raw
+    # pattern‑style
+    patterns: List[Dict[str, Any]] = rules.get("non_colon_patterns", [])
+    for seg in plain_segs:
+        for pat in patterns:
+            if not matches(seg, pat):
+                continue
+            apply_pat(res, seg, pat)
+    return res
+
+
+# pattern helpers -----------------------------------------------------------
+def matches(seg: str, pat: Dict[str, Any]) -> bool:
+    return any(
+        (
+            "contains" in pat and pat["contains"] in seg,
+            "contains_any" in pat and any(c in seg for c in pat["contains_any"]),
+            "endswith" in pat and seg.endswith(pat["endswith"]),
+            "regex" in pat and pat["_regex"].search(seg),
+        )
+    )
+
+
+def apply_pat(out: Dict[str, Any], seg: str, pat: Dict[str, Any]) -> None:
+    key = pat["key"]
+    if "extract_all" in pat:
+        out[key] = pat["_extract_all"].findall(seg)
+    elif "extract" in pat and (m := pat["_extract"].search(seg)):
+        out[key] = m.group(1)
+    elif "groups" in pat and (m := pat["_regex"].search(seg)):
+        gs = pat["groups"]
+        out[key] = m.group(gs[0]) if len(gs) == 1 else [m.group(i) for i in gs]
+    elif "split_on" in pat:
+        out[key] = [x.strip() for x in seg.split(pat["split_on"])]
+    else:
+        out[key] = seg
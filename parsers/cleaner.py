@@ -49,19 +49,15 @@ def clean_csv(csv_path: Path, out_path: Path, rules: Dict[str, List[str]]):
     df = pd.read_csv(csv_path)
     name_col = "Name" if "Name" in df.columns else df.columns[1]  # fallback
 
-    contains = rules.get("drop_if_name_contains", [])
-    regexes  = [re.compile(r, re.I) for r in rules.get("drop_if_name_regex", [])]
-
-    mask = pd.Series(False, index=df.index)
-
-    # contains 조건
-    if contains:
-        pattern = re.compile("|".join(map(re.escape, contains)), re.I)
-        mask |= df[name_col].str.contains(pattern)
-
-    # regex 조건
-    for rgx in regexes:
-        mask |= df[name_col].str.contains(rgx)
+    # contains(리터럴) + regex 조건을 하나의 패턴으로 합쳐 컬럼 1회 스캔
+    patterns = [re.escape(c) for c in rules.get("drop_if_name_contains", [])]
+    patterns += list(rules.get("drop_if_name_regex", []))
+
+    if patterns:
+        big = re.compile("|".join(f"(?:{p})" for p in patterns), re.I)
+        mask = df[name_col].str.contains(big, na=False)
+    else:
+        mask = pd.Series(False, index=df.index)
 
     removed = mask.sum()
     df_filtered = df[~mask]
@@ -5,11 +5,12 @@
 from __future__ import annotations
 
 import argparse
-import json
+import csv
 import re
 from pathlib import Path
-from typing import Any, Dict, List, Mapping
+from typing import Any, Dict, List, Mapping, Optional, Tuple
 
+import orjson
 import pandas as pd
 
 # ──────────────────────────────── paths & constants ────────────────────────────────── #
@@ -49,25 +50,41 @@ _REMOVE_WORDS  = ("AMD", "인텔", "시리즈2")
 _REPLACE_MAP   = {"Core": "코어", "Ryzen": "라이젠", "Ultra": "울트라"}
 _REMOVE_PATTERN = re.compile("|".join(map(re.escape, _REMOVE_WORDS)))
 
+# (소문자 모델명, 메모리 토큰|None) → (CSV 순번, 점수)  - 순번은 원래의 "첫 매칭 우선" 규칙 유지용
+GpuBenchKey = Tuple[str, Optional[str]]
+GpuBenchMap = Dict[GpuBenchKey, Tuple[int, Dict[str, int]]]
+
 # ──────────────────────────────── util helpers ─────────────────────────────────────── #
 def _load_json(path: Path) -> List[Dict[str, Any]]:
-    return json.loads(path.read_text(encoding="utf-8"))
+    return orjson.loads(path.read_bytes())
 
 def _save_json(data: List[Dict[str, Any]], path: Path) -> None:
-    path.write_text(json.dumps(data, ensure_ascii=False, indent=2), encoding="utf-8")
+    # json.dumps(ensure_ascii=False, indent=2) 와 동일한 바이트 출력
+    path.write_bytes(orjson.dumps(data, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY))
+
+def _dump_indented(item: Any) -> bytes:
+    """리스트 원소 1개를 indent=2 배열 내부(한 단계 들여쓰기) 형식으로 직렬화"""
+    return orjson.dumps(item, option=orjson.OPT_INDENT_2 | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY).replace(b"\n", b"\n  ")
 
 # ───────────────────────── price / stock helpers ───────────────────────────────────── #
 def _load_price_map(csv_path: Path) -> Dict[int, int]:
+    """ID,Price 2열 CSV → {id: price} (가격 없음/숫자 아님 행은 제외)"""
     if not csv_path.exists():
         return {}
-    df = pd.read_csv(csv_path, dtype={"ID": "int64", "Price": "string"})
-    df["Price"] = pd.to_numeric(df["Price"], errors="coerce")
-    return (
-        df.dropna(subset=["Price"])
-          .astype({"Price": "int64"})
-          .set_index("ID")["Price"]
-          .to_dict()
-    )
+    out: Dict[int, int] = {}
+    with csv_path.open(encoding="utf-8", newline="") as fp:
+        reader = csv.reader(fp)
+        header = next(reader, [])
+        pid_i, price_i = header.index("ID"), header.index("Price")
+        for row in reader:
+            price = row[price_i]
+            if not price:
+                continue
+            try:
+                out[int(row[pid_i])] = int(float(price))
+            except ValueError:
+                pass
+    return out
 
 def _update_price_stock(products: List[Dict[str, Any]], price_map: Mapping[int, int]) -> None:
     for p in products:
@@ -98,7 +115,14 @@ def _load_cpu_bench_map(csv_path: Path) -> Dict[str, Dict[str, int]]:
     df["norm_name"] = _norm_series(df["name"])
     return df.set_index("norm_name")[num_cols].to_dict("index")
 
-def _load_gpu_bench_map(csv_path: Path) -> Dict[str, Dict[str, int]]:
+def _gpu_bench_key(bench_name: str) -> GpuBenchKey:
+    """'RTX 4060 (8GB)' → ('rtx 4060', '8GB'), 메모리 표기 없으면 ('rtx 4060', None)"""
+    tokens = bench_name.replace("(", "").replace(")", "").split()
+    if "GB" in bench_name:
+        return " ".join(tokens[:-1]).lower(), tokens[-1]
+    return bench_name.lower(), None
+
+def _load_gpu_bench_map(csv_path: Path) -> GpuBenchMap:
     if not csv_path.exists():
         return {}
     df = pd.read_csv(csv_path)
@@ -112,29 +136,30 @@ def _load_gpu_bench_map(csv_path: Path) -> Dict[str, Dict[str, int]]:
           .fillna(0)
           .astype(int)
     )
-    return df.set_index("name")[num_cols].to_dict("index")
+    # 벤치 이름 파싱은 로드 시 1회 → 제품별 조회는 O(1)
+    bench_map: GpuBenchMap = {}
+    for order, (name, scores) in enumerate(df.set_index("name")[num_cols].to_dict("index").items()):
+        bench_map.setdefault(_gpu_bench_key(name), (order, scores))
+    return bench_map
 
 def _attach_cpu_benchmarks(products: List[Dict[str, Any]], bench_map: Mapping[str, Mapping[str, int]]) -> None:
-    for prod in products:
-        norm = _norm_series(pd.Series([prod.get("name", "")]))[0]
+    # 제품명 전체를 Series 하나로 한 번에 정규화 (벤치 CSV 쪽과 동일한 _norm_series 사용)
+    norms = _norm_series(pd.Series([prod.get("name") or "" for prod in products], dtype=object)).tolist()
+    for prod, norm in zip(products, norms):
         if (scores := bench_map.get(norm)):
             prod.setdefault("spec", {}).update({k: str(v) for k, v in scores.items() if v})
 
-def _attach_gpu_benchmarks(products: List[Dict[str, Any]], bench_map: Mapping[str, Mapping[str, int]]) -> None:
+def _attach_gpu_benchmarks(products: List[Dict[str, Any]], bench_map: GpuBenchMap) -> None:
     for prod in products:
         spec     = prod.setdefault("spec", {})
         chipset  = spec.get("chipset", "").strip().lower()
         memcap   = spec.get("memory_capacity", "").strip()
 
-        for bench_name, scores in bench_map.items():
-            tokens = bench_name.replace("(", "").replace(")", "").split()
-            if "GB" in bench_name:
-                model, mem_tok = " ".join(tokens[:-1]).lower(), tokens[-1]
-            else:
-                model, mem_tok = bench_name.lower(), None
-            if model == chipset and (mem_tok is None or mem_tok == memcap):
-                spec.update({k: str(v) for k, v in scores.items() if v})
-                break
+        # 메모리 일치 항목 / 메모리 무관 항목 중 CSV 에서 먼저 나온 쪽 (기존 순차 탐색과 동일)
+        hits = [h for h in (bench_map.get((chipset, memcap)), bench_map.get((chipset, None))) if h]
+        if hits:
+            _, scores = min(hits, key=lambda h: h[0])
+            spec.update({k: str(v) for k, v in scores.items() if v})
 
 # ─────────────────────────── storage consolidator ────────────────────────────
 def _consolidate_storage(final_dir: Path) -> None:
@@ -147,20 +172,21 @@ def _consolidate_storage(final_dir: Path) -> None:
         print("[!] SSD/HDD 파일이 없습니다 → 통합 스킵")
         return
 
-    def _load_and_tag(path: Path, cat: str) -> List[Dict[str, Any]]:
-        if not path.exists():
-            return []
-        data = _load_json(path)
-        for prod in data:                           # spec 안에 category 삽입
-            prod.setdefault("spec", {})["category"] = cat
-        return data
-
-    storage_products = (
-        _load_and_tag(ssd_file, "SSD") +
-        _load_and_tag(hdd_file, "HDD")
-    )
+    # 파일 단위로 읽어 항목별로 바로 기록 → SSD+HDD 합본 리스트를 메모리에 만들지 않음
+    # (출력은 _save_json 과 동일한 indent=2 형식)
+    with final_file.open("wb") as out:
+        out.write(b"[")
+        first = True
+        for path, cat in ((ssd_file, "SSD"), (hdd_file, "HDD")):
+            if not path.exists():
+                continue
+            for prod in _load_json(path):           # spec 안에 category 삽입
+                prod.setdefault("spec", {})["category"] = cat
+                out.write(b"\n  " if first else b",\n  ")
+                out.write(_dump_indented(prod))
+                first = False
+        out.write(b"]" if first else b"\n]")
 
-    _save_json(storage_products, final_file)
     print(f"Storage → {final_file.relative_to(final_dir.parent.parent)} created")
 
     # ─── SSD/HDD 최종 JSON 삭제 ───────────────────────────
@@ -7,13 +7,20 @@ exported – just `GenericParser`.
 from __future__ import annotations
 
 import csv
-import json
+import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from typing import Any, Dict, List, Mapping, Set
 
+import orjson
 import yaml
 
+try:  # `python parser.py` (parsers/ 가 sys.path) 실행 / 프로젝트 루트에서 import
+    from _parse_core import parse_spec
+except ImportError:
+    from parsers._parse_core import parse_spec
+
 __all__ = ["GenericParser"]
 
 # ──────────────────────────────── configuration paths ───────────────────────────────── #
@@ -64,18 +71,42 @@ class GenericParser:
                 )
                 for rule in meta.get("name_rules", [])
             ]
+            # non_colon_patterns 정규식도 선‑컴파일 (행·세그먼트마다 re 캐시 조회 생략)
+            for pat in (meta.get("spec") or {}).get("non_colon_patterns", []):
+                for field in ("regex", "extract", "extract_all"):
+                    if field in pat:
+                        pat[f"_{field}"] = re.compile(pat[field])
 
     # public -----------------------------------------------------------------
     def parse(self, category: str, row: Mapping[str, str]) -> Dict[str, Any]:
+        return self.parse_fields(
+            category,
+            row["ID"],
+            row["Name"],
+            row.get("Spec", ""),
+            row.get("ImageURL"),
+            row.get("ProductURL"),
+        )
+
+    def parse_fields(
+        self,
+        category: str,
+        pid: str,
+        name: str,
+        spec: str,
+        image_url: str | None,
+        product_url: str | None,
+    ) -> Dict[str, Any]:
+        """parse() 의 위치 인자 버전 - csv.reader 튜플을 dict 없이 바로 전달"""
         if category not in self.cfg:
             raise ValueError(f"No config for category '{category}'")
         rules = self.cfg[category]
         return {
-            "id": int(row["ID"]),
-            **self._parse_name(row["Name"], category),
-            **self._parse_spec(row.get("Spec", ""), rules.get("spec", {})),
-            "image_url": row.get("ImageURL"),
-            "product_url": row.get("ProductURL"),
+            "id": int(pid),
+            **self._parse_name(name, category),
+            **self._parse_spec(spec, rules.get("spec", {})),
+            "image_url": image_url,
+            "product_url": product_url,
         }
 
     # internal ---------------------------------------------------------------
@@ -89,96 +120,44 @@ class GenericParser:
         return out
 
     def _parse_spec(self, spec: str, rules: Dict[str, Any]) -> Dict[str, Any]:
-        spec = self._preprocess(spec)
-        segments = self._split_segments(spec)
-        return self._apply_rules(segments, rules)
-
-    # helpers ---------------------------------------------------------------
-    @staticmethod
-    def _preprocess(txt: str) -> str:
-        repl = {
-            "A/S": "AS",
-            "S/W": "SW",
-            "Gb/s": "Gbs",
-            "MB/s": "Mbs",
-            "싱글/다중": "싱글,다중",
-        }
-        for a, b in repl.items():
-            txt = txt.replace(a, b)
-        if "유휴/탐색" in txt and "소음(" in txt:
-            s, e = txt.find("소음("), txt.rfind("dB") + 2
-            txt = txt[:s] + txt[s:e].replace("/", ",") + txt[e:]
-        if "순차읽기" in txt:
-            for tag in ("순차읽기:", "순차쓰기:", "읽기IOPS:", "쓰기IOPS:"):
-                txt = txt.replace(tag, tag[:-1])
-        return txt
-
-    @staticmethod
-    def _split_segments(spec: str) -> List[str]:
-        outer = " ".join(re.split(r"\[[^]]*]", spec))
-        return [s.strip() for seg in outer.split("/") if (s := seg.strip())]
-
-    def _apply_rules(self, segments: List[str], rules: Dict[str, Any]) -> Dict[str, Any]:
-        res: Dict[str, Any] = {}
-        colon_cfg = rules.get("colon_keys", {})
-        # colon‑style
-        for seg in (s for s in segments if ":" in s):
-            k_raw, v_raw = (t.strip() for t in seg.split(":", 1))
-            if k_raw in colon_cfg:
-                ek = colon_cfg[k_raw]
-                res[ek] = [v.strip() for v in v_raw.split(",")] if "," in v_raw else v_raw.strip()
-        # pattern‑style
-        for seg in (s for s in segments if ":" not in s):
-            for pat in rules.get("non_colon_patterns", []):
-                if not self._matches(seg, pat):
-                    continue
-                self._apply_pat(res, seg, pat)
-        return res
-
-    # pattern helpers -------------------------------------------------------
-    @staticmethod
-    def _matches(seg: str, pat: Dict[str, Any]) -> bool:
-        return any(
-            (
-                "contains" in pat and pat["contains"] in seg,
-                "contains_any" in pat and any(c in seg for c in pat["contains_any"]),
-                "endswith" in pat and seg.endswith(pat["endswith"]),
-                "regex" in pat and re.search(pat["regex"], seg),
+        # 전처리 → 세그먼트 분할 → 규칙 적용은 _parse_core (mypyc 빌드 가능) 에서 수행
+        return parse_spec(spec, rules)
+
+# ─────────────────────────── simple demo: parse all parts ────────────────────────────── #
+def parse_part(part: str) -> Path:
+    """한 파트의 clean CSV → parsed JSON (프로세스 풀 워커, 워커마다 파서 생성)"""
+    parser = GenericParser()
+    src_path = BASE_DIR / "data" / "raw" / part / f"{part}_info_clean.csv"
+    dest_path = BASE_DIR / "data" / "parsed" / f"{part}_parsed.json"
+    records: List[Dict[str, Any]] = []
+    with src_path.open(encoding="utf-8", newline="") as fp:
+        reader = csv.reader(fp)
+        # 헤더에서 컬럼 위치를 한 번만 해석 → 행마다 dict 생성 없음
+        idx = {h: i for i, h in enumerate(next(reader))}
+        i_id, i_name = idx["ID"], idx["Name"]
+        i_spec, i_img, i_url = idx.get("Spec"), idx.get("ImageURL"), idx.get("ProductURL")
+        for row in reader:
+            flat = parser.parse_fields(
+                part,
+                row[i_id],
+                row[i_name],
+                row[i_spec] if i_spec is not None else "",
+                row[i_img] if i_img is not None else None,
+                row[i_url] if i_url is not None else None,
             )
-        )
+            grouped = {
+                **{k: flat[k] for k in _TOP_LEVEL_FIELDS if k in flat},
+                "spec": {k: v for k, v in flat.items() if k not in _TOP_LEVEL_FIELDS},
+            }
+            records.append(grouped)
+    dest_path.write_bytes(orjson.dumps(records, option=orjson.OPT_INDENT_2))
+    return dest_path
 
-    @staticmethod
-    def _apply_pat(out: Dict[str, Any], seg: str, pat: Dict[str, Any]) -> None:
-        key = pat["key"]
-        if "extract_all" in pat:
-            out[key] = re.findall(pat["extract_all"], seg)
-        elif "extract" in pat and (m := re.search(pat["extract"], seg)):
-            out[key] = m.group(1)
-        elif "groups" in pat and (m := re.search(pat["regex"], seg)):
-            gs = pat["groups"]
-            out[key] = m.group(gs[0]) if len(gs) == 1 else [m.group(i) for i in gs]
-        elif "split_on" in pat:
-            out[key] = [x.strip() for x in seg.split(pat["split_on"])]
-        else:
-            out[key] = seg
 
-# ─────────────────────────── simple demo: parse all parts ────────────────────────────── #
 if __name__ == "__main__":
-    parser = GenericParser()
-    parsed_dir = BASE_DIR / "data" / "parsed"
-    parsed_dir.mkdir(parents=True, exist_ok=True)
-
-    for part in parts:
-        src_path = BASE_DIR / "data" / "raw" / part / f"{part}_info_clean.csv"
-        dest_path = parsed_dir / f"{part}_parsed.json"
-        records: List[Dict[str, Any]] = []
-        with src_path.open(encoding="utf-8") as fp:
-            for row in csv.DictReader(fp):
-                flat = parser.parse(part, row)
-                grouped = {
-                    **{k: flat[k] for k in _TOP_LEVEL_FIELDS if k in flat},
-                    "spec": {k: v for k, v in flat.items() if k not in _TOP_LEVEL_FIELDS},
-                }
-                records.append(grouped)
-        dest_path.write_text(json.dumps(records, ensure_ascii=False, indent=2), encoding="utf-8")
-        print(f"{part} → {dest_path.relative_to(BASE_DIR)}")
+    (BASE_DIR / "data" / "parsed").mkdir(parents=True, exist_ok=True)
+
+    # 파트별 정규식 파싱은 CPU 바운드·상호 독립 → 프로세스 병렬
+    with ProcessPoolExecutor(max_workers=min(len(parts), os.cpu_count() or 1)) as ex:
+        for part, dest_path in zip(parts, ex.map(parse_part, parts)):
+            print(f"{part} → {dest_path.relative_to(BASE_DIR)}")